@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,133 @@ class Settings(BaseSettings):
     gmail_address: str = ""
     gmail_app_password: str = ""
 
+    # Backends: "gemini" / "duckduckgo" for real runs, "fake" for offline
+    # stand-ins with simulated latency and errors (benchmarks, local demos)
+    llm_backend: str = "gemini"
+    search_backend: str = "duckduckgo"
+    fake_llm_latency: float = 0.5
+    fake_search_latency: float = 0.3
+    fake_error_rate: float = 0.0
+    fake_responses_file: str = ""
+    fake_seed: Optional[int] = None
+
+    # Outgoing mail (defaults to Gmail; point at a local SMTP server for testing)
+    smtp_host: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    smtp_start_tls: bool = True
+    smtp_pool_size: int = 5
+    smtp_timeout: float = 30
+    smtp_max_retries: int = 4
+    smtp_retry_base_delay: float = 1.0
+
+    # Process-wide rate limits shared by every Gemini call and every search.
+    # Off by default (0 = unlimited) so paid tiers keep their concurrency; on
+    # the Gemini free tier set 15 requests / 250000 tokens per minute and 30
+    # searches per minute. Calls rejected with 429/5xx are retried with
+    # jittered exponential backoff either way.
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+    llm_max_retries: int = 5
+    llm_retry_base_delay: float = 2.0
+    search_requests_per_minute: int = 0
+    search_max_retries: int = 3
+    search_retry_base_delay: float = 2.0
+
+    # Gemini pricing (USD per million tokens) for the cost estimates on
+    # /metrics and in analysis summaries
+    llm_input_cost_per_million: float = 0.10
+    llm_output_cost_per_million: float = 0.40
+
+    # Claim extraction: decks are split into page-aligned chunks of at most
+    # this many characters and the chunks are extracted in parallel
+    claim_chunk_chars: int = 3000
+    claim_extraction_concurrency: int = 8
+    # Characters of extracted claims given to the /analyze question prompt
+    question_context_chars: int = 6000
+
+    # Research agent fan-out
+    research_concurrency: int = 5
+    research_claim_budget: int = 8
+
+    # Stream claim extraction and start researching high-importance claims
+    # as soon as each one is parsed, overlapping extraction and research
+    pipeline_research: bool = True
+
+    # Verification agent batching (batch size 1 = one call per claim)
+    verification_batch_size: int = 5
+    verification_concurrency: int = 3
+
+    # Analysis result cache, keyed on PDF hash + model + prompt version
+    cache_dir: str = ".cache"
+    result_cache_enabled: bool = True
+    result_cache_ttl_seconds: int = 7 * 24 * 3600
+    result_cache_max_mb: int = 256
+
+    # Search result cache (in-process LRU in front of SQLite), TTL per tool
+    search_cache_enabled: bool = True
+    search_cache_memory_entries: int = 1024
+    search_cache_max_mb: int = 128
+    search_cache_ttl_seconds: Dict[str, int] = {
+        "default": 24 * 3600,
+        "web_search": 24 * 3600,
+        "search_company_info": 3 * 24 * 3600,
+        "search_market_data": 30 * 24 * 3600,
+        "search_person": 30 * 24 * 3600,
+        "search_technology": 14 * 24 * 3600,
+        "analyze_competitor": 7 * 24 * 3600,
+    }
+
+    # Prompt-level LLM response cache (opt-in)
+    llm_cache_enabled: bool = False
+    llm_cache_memory_entries: int = 512
+    llm_cache_max_mb: int = 256
+    llm_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    # Cross-deck store of verified claims: fresh matches (exact or near-duplicate
+    # wording) skip research and verification
+    claim_store_enabled: bool = True
+    claim_store_max_age_seconds: int = 30 * 24 * 3600
+    claim_store_near_duplicates: bool = True
+    claim_store_similarity: float = 0.8
+
+    # PDF extraction: decks with at least this many pages are parsed in a
+    # process pool (0 workers = one per CPU)
+    pdf_parallel_min_pages: int = 40
+    pdf_parse_workers: int = 0
+
+    # Uploads are streamed to disk in chunks and rejected above this size
+    max_upload_mb: int = 50
+    upload_chunk_size: int = 1024 * 1024
+
+    # Stored decks: identical PDFs share one blob in upload_dir. Blobs unread
+    # for upload_ttl_days are deleted, and least recently used ones once the
+    # total passes upload_quota_mb (0 disables either limit)
+    upload_quota_mb: int = 10 * 1024
+    upload_ttl_days: int = 30
+
+    # Background analysis jobs (state persisted under data_dir). Workers in
+    # every process poll the shared queue; a running job whose worker stops
+    # heartbeating for job_lease_seconds is handed to another worker
+    data_dir: str = "data"
+    job_workers: int = 2
+    job_retention_seconds: int = 7 * 24 * 3600
+    job_lease_seconds: int = 120
+    job_poll_seconds: float = 2.0
+
+    # Deck metadata and analysis results: "sqlite" (a file under data_dir) or
+    # "package.module:ClassName" for a custom ResultsStore
+    results_store: str = "sqlite"
+
+    # Number of uvicorn worker processes sharing this host's data and cache
+    # directories; per-process rate limits get an equal share of the quota
+    worker_processes: int = 1
+
+    # Batch analysis: decks analyzed at once, decks per batch, and the size
+    # limit for an uploaded zip of decks
+    batch_concurrency: int = 4
+    batch_max_decks: int = 100
+    batch_max_upload_mb: int = 500
+
     class Config:
         env_file = ".env"
 
@@ -1,11 +1,39 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import pitch_deck, email_webhook
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.routes import pitch_deck, email_webhook, jobs, batch
+from app.services.container import ServiceContainer
+from app.services.metrics import render_prometheus
+from app.services.pdf_parser import shutdown_process_pool
+from app.config import get_settings
+
+# Allowance for multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One set of services per app; each is built on first use
+    services = ServiceContainer()
+    app.state.services = services
+
+    # Background analysis workers run for the lifetime of the app
+    jobs.register_jobs(services)
+    email_webhook.register_jobs(services)
+    await services.job_queue.start()
+    yield
+    await services.aclose()
+    # Worker processes for large-deck extraction outlive requests; stop them with the app
+    await asyncio.to_thread(shutdown_process_pool)
+
 
 app = FastAPI(
     title="Sago Pitch Deck Analyzer",
     description="AI-powered pitch deck verification and question generation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -17,9 +45,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized request bodies from Content-Length before reading them"""
+    content_length = request.headers.get("content-length")
+    settings = get_settings()
+    # Batch uploads carry many decks in one zip
+    limit_mb = settings.batch_max_upload_mb if request.url.path.startswith("/api/batch/") else settings.max_upload_mb
+    max_bytes = limit_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        return JSONResponse(
+            {"detail": f"Request body exceeds the {limit_mb} MB upload limit"},
+            status_code=413
+        )
+    return await call_next(request)
+
+
 # Include routers
 app.include_router(pitch_deck.router)
 app.include_router(email_webhook.router)
+app.include_router(jobs.router)
+app.include_router(batch.router)
 
 
 @app.get("/")
@@ -29,3 +76,17 @@ async def root():
         "docs": "/docs",
         "version": "1.0.0"
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Node, Gemini and search tool metrics in Prometheus text format"""
+    services = request.app.state.services
+    extra = []
+    if services.is_loaded("job_queue"):
+        extra = [
+            "# HELP pitchdeck_job_queue_depth Background jobs waiting for a worker",
+            "# TYPE pitchdeck_job_queue_depth gauge",
+            f"pitchdeck_job_queue_depth {services.job_queue.queue_depth()}",
+        ]
+    return PlainTextResponse(render_prometheus(extra), media_type="text/plain; version=0.0.4")
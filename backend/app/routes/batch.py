@@ -0,0 +1,253 @@
+"""
+Batch analysis: many decks in one request, results streamed as each deck finishes
+"""
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.routes import pitch_deck
+from app.services.batch import BatchScope
+from app.services.container import ServiceContainer, get_services
+from app.services.storage import UploadTooLargeError, save_upload
+from app.services.upload_store import UploadStore
+from app.config import get_settings
+import asyncio
+import os
+import time
+import uuid
+import zipfile
+from typing import Any, AsyncIterator, Dict, List
+
+router = APIRouter(prefix="/api/batch", tags=["batch"])
+
+
+class BatchRequest(BaseModel):
+    file_ids: List[str]
+    use_cache: bool = True
+
+
+@router.post("/analyze")
+async def analyze_batch(
+    request: BatchRequest,
+    services: ServiceContainer = Depends(get_services)
+) -> StreamingResponse:
+    """
+    Run the multi-agent workflow over already uploaded decks and stream the
+    results as Server-Sent Events. See run_batch for the events.
+    """
+    # Drop repeated ids but keep the order they were given in
+    file_ids = list(dict.fromkeys(request.file_ids))
+    if not file_ids:
+        raise HTTPException(status_code=400, detail="No file ids given")
+    _check_batch_size(len(file_ids))
+    for file_id in file_ids:
+        try:
+            uuid.UUID(file_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid file id: {file_id}")
+
+    decks = [{"file_id": file_id, "filename": None} for file_id in file_ids]
+    return _event_response(run_batch(services, decks, request.use_cache))
+
+
+@router.post("/analyze-zip")
+async def analyze_batch_zip(
+    file: UploadFile = File(...),
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> StreamingResponse:
+    """
+    Upload a zip of pitch deck PDFs, analyze every deck and stream the results
+    as Server-Sent Events. Each deck gets a file_id (listed in batch_started) that
+    works with the single-deck endpoints afterwards.
+    """
+    if not file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Only zip files are allowed")
+
+    settings = get_settings()
+    upload_store = services.upload_store
+    # The zip itself is only needed until its decks are in the store
+    with upload_store.temp_path(".zip") as zip_path:
+        try:
+            await save_upload(
+                file,
+                zip_path,
+                max_bytes=settings.batch_max_upload_mb * 1024 * 1024,
+                chunk_size=settings.upload_chunk_size
+            )
+            decks = await asyncio.to_thread(extract_decks, upload_store, zip_path)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Not a valid zip file")
+
+    if not decks:
+        raise HTTPException(status_code=400, detail="The zip contains no PDF files")
+    for deck in decks:
+        if deck["file_id"] is not None:
+            await services.results_store.put_deck(
+                deck["file_id"],
+                {"filename": deck["filename"], "sha256": deck["sha256"], "size_bytes": deck["size_bytes"]}
+            )
+    return _event_response(run_batch(services, decks, use_cache))
+
+
+def _check_batch_size(count: int):
+    max_decks = get_settings().batch_max_decks
+    if count > max_decks:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {max_decks} decks, got {count}")
+
+
+def extract_decks(upload_store: UploadStore, zip_path: str) -> List[Dict[str, Any]]:
+    """
+    Store each PDF in the zip as an upload under a new file_id.
+    Members that are too large or unreadable are returned with an error
+    instead of failing the whole batch.
+    """
+    settings = get_settings()
+    max_bytes = settings.max_upload_mb * 1024 * 1024
+
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [
+            member for member in archive.infolist()
+            if not member.is_dir()
+            and member.filename.lower().endswith('.pdf')
+            # Skip macOS resource forks and other hidden files
+            and not member.filename.startswith('__MACOSX/')
+            and not os.path.basename(member.filename).startswith('.')
+        ]
+        _check_batch_size(len(members))
+
+        decks = []
+        for member in members:
+            filename = os.path.basename(member.filename)
+            if member.file_size > max_bytes:
+                decks.append({"file_id": None, "filename": filename,
+                              "error": f"File exceeds the {settings.max_upload_mb} MB upload limit"})
+                continue
+
+            try:
+                with archive.open(member) as source:
+                    stored = upload_store.save_stream(source, filename, max_bytes, settings.upload_chunk_size)
+            except (UploadTooLargeError, zipfile.BadZipFile, OSError, EOFError) as e:
+                decks.append({"file_id": None, "filename": filename, "error": f"Could not extract: {str(e)}"})
+                continue
+            decks.append({
+                "file_id": stored.file_id, "filename": filename, "sha256": stored.sha256, "size_bytes": stored.size
+            })
+    return decks
+
+
+async def run_batch(
+    services: ServiceContainer,
+    decks: List[Dict[str, Any]],
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze decks with at most BATCH_CONCURRENCY in flight. Decks in the batch
+    share identical searches and claim research (see app.services.batch).
+
+    Events: batch_started (the decks), then deck_complete (with the same result
+    as /analyze-with-agents) or deck_failed for each deck in the order they
+    finish, and finally batch_complete with a throughput report.
+    """
+    settings = get_settings()
+    scope = BatchScope()
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+    started = time.perf_counter()
+
+    async def analyze(deck: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            deck_started = time.perf_counter()
+            try:
+                result = await pitch_deck.run_agent_analysis(services, deck["file_id"], use_cache)
+            except HTTPException as e:
+                return {"event": "deck_failed", **deck, "detail": e.detail}
+            except Exception as e:
+                return {"event": "deck_failed", **deck, "detail": f"Agent workflow failed: {str(e)}"}
+            return {
+                "event": "deck_complete",
+                **deck,
+                "seconds": round(time.perf_counter() - deck_started, 3),
+                "result": result
+            }
+
+    yield {
+        "event": "batch_started",
+        "decks": decks,
+        "concurrency": max(1, settings.batch_concurrency)
+    }
+
+    outcomes = []
+    for deck in decks:
+        if deck.get("error"):
+            outcome = {"event": "deck_failed", "file_id": None, "filename": deck["filename"], "detail": deck["error"]}
+            outcomes.append(outcome)
+            yield outcome
+
+    print(f"📦 Batch of {len(decks)} deck(s), {max(1, settings.batch_concurrency)} at a time")
+    tasks = [scope.start(analyze(deck)) for deck in decks if not deck.get("error")]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            outcomes.append(outcome)
+            yield outcome
+    finally:
+        # Client went away mid-batch: stop the decks still running
+        for task in tasks:
+            task.cancel()
+        scope.close()
+
+    report = throughput_report(outcomes, time.perf_counter() - started, scope)
+    print(f"✅ Batch complete: {report['succeeded']}/{report['decks']} decks, "
+          f"{report['decks_per_minute']} decks/min")
+    yield {"event": "batch_complete", "report": report}
+
+
+def throughput_report(outcomes: List[Dict[str, Any]], elapsed: float, scope: BatchScope) -> Dict[str, Any]:
+    """Aggregate timings, usage and deduplication for a finished batch"""
+    completed = [o for o in outcomes if o["event"] == "deck_complete"]
+    fresh = [o["result"].get("summary", {}) for o in completed if not o["result"].get("cached")]
+    seconds = sorted(o["seconds"] for o in completed)
+
+    def usage_total(section: str, key: str):
+        return sum(summary.get("usage", {}).get(section, {}).get(key, 0) for summary in fresh)
+
+    def percentile(pct: float) -> float:
+        return seconds[min(len(seconds) - 1, round(pct / 100 * (len(seconds) - 1)))]
+
+    return {
+        "decks": len(outcomes),
+        "succeeded": len(completed),
+        "failed": len(outcomes) - len(completed),
+        "cached": len(completed) - len(fresh),
+        "wall_seconds": round(elapsed, 3),
+        "decks_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "deck_seconds": {
+            "mean": round(sum(seconds) / len(seconds), 3),
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "max": seconds[-1],
+        } if seconds else {},
+        "claims": sum(o["result"].get("summary", {}).get("total_claims", 0) for o in completed),
+        "reused_verifications": sum(summary.get("reused_verifications", 0) for summary in fresh),
+        "llm": {
+            "calls": usage_total("llm", "calls"),
+            "input_tokens": usage_total("llm", "input_tokens"),
+            "output_tokens": usage_total("llm", "output_tokens"),
+            "estimated_cost_usd": round(usage_total("llm", "estimated_cost_usd"), 6),
+        },
+        "searches": usage_total("tools", "calls"),
+        "deduplication": scope.stats(),
+    }
+
+
+def _event_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    async def event_stream():
+        async for event in events:
+            yield pitch_deck._sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,26 +1,63 @@
 """
 Email Webhook Endpoint for receiving pitch decks via email
 """
-from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import JSONResponse
-from app.services.pdf_parser import PDFParser
-from app.services.langgraph_agents import PitchDeckVerificationGraph
-from app.services.email_service import EmailService
+from starlette.datastructures import UploadFile as FormFile
+from app.routes import pitch_deck
+from app.services.container import ServiceContainer, get_services
+from app.services.storage import UploadTooLargeError
+from app.config import get_settings
 from email import message_from_string
 from email.policy import default
-import os
-import uuid
-import tempfile
-from typing import Optional
+from typing import Any, Dict, Optional
 
 router = APIRouter(prefix="/api/email", tags=["email"])
 
-pdf_parser = PDFParser()
-langgraph_agent = PitchDeckVerificationGraph()
-email_service = EmailService()
 
+async def email_analysis_job(services: ServiceContainer, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze an emailed deck (or reuse a cached analysis) and mail the results back"""
+    sender = payload["sender"]
+    langgraph_agent = services.langgraph_agent
 
-@router.post("/webhook")
+    # Forwarded decks are often ones we have already analyzed
+    result = await services.result_cache.get(payload["pdf_hash"], "langgraph", langgraph_agent.model_name)
+
+    if result is not None:
+        print("⚡ Using cached analysis for this deck")
+    else:
+        document = await pitch_deck.load_document(services, payload["file_id"])
+        print(f"📄 Extracted {len(document.text)} characters from PDF")
+
+        # Run analysis, or attach to a web request already analyzing the same deck
+        print("🚀 Running multi-agent analysis...")
+        result = await pitch_deck.shared_agent_analysis(services, document)
+
+    # Send results via email
+    print(f"📤 Sending results to {sender}")
+    email_sent = await services.email_service.send_analysis_results(
+        to_email=sender,
+        company_name=result.get('company_name', 'Unknown'),
+        verification_results=result.get('verification_results', []),
+        questions=result.get('questions', []),
+        summary=result.get('summary', {})
+    )
+    if not email_sent:
+        raise RuntimeError(f"Failed to send analysis email to {sender}")
+
+    print(f"✅ Analysis sent to {sender}")
+    return {"sender": sender, "company_name": result.get('company_name', 'Unknown')}
+
+
+def register_jobs(services: ServiceContainer):
+    """Register this module's job handlers with the app's queue"""
+    async def handler(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await email_analysis_job(services, payload)
+
+    services.job_queue.register("email_analysis", handler)
+
+
+@router.post("/webhook", status_code=202)
 async def email_webhook(
     request: Request,
     sender: str = Form(...),
@@ -28,73 +65,68 @@ async def email_webhook(
     recipient: str = Form(None),
     body_plain: str = Form(None),
     body_html: str = Form(None),
-    attachment_count: int = Form(0)
+    attachment_count: int = Form(0),
+    services: ServiceContainer = Depends(get_services)
 ):
     """
     Mailgun email webhook endpoint
-    Receives emails with pitch deck PDFs and sends analysis results
+    Receives emails with pitch deck PDFs, acknowledges immediately and queues
+    the analysis; results are emailed back to the sender by a background job
     """
     print(f"📧 Received email from {sender}")
     print(f"   Subject: {subject}")
     print(f"   Attachments: {attachment_count}")
-    
+
     try:
         # Get all form data
         form_data = await request.form()
-        
+
         # Find PDF attachment
         pdf_file = None
         for key in form_data:
             if key.startswith('attachment-'):
                 file = form_data[key]
-                if isinstance(file, UploadFile) and file.filename.endswith('.pdf'):
+                # Parsed form values are Starlette UploadFiles, not FastAPI's subclass
+                if isinstance(file, FormFile) and file.filename.endswith('.pdf'):
                     pdf_file = file
                     break
-        
+
         if not pdf_file:
             return JSONResponse({
                 "status": "error",
                 "message": "No PDF attachment found"
             }, status_code=400)
-        
-        # Save PDF temporarily
-        temp_file_path = f"/tmp/{uuid.uuid4()}.pdf"
-        with open(temp_file_path, "wb") as f:
-            content = await pdf_file.read()
-            f.write(content)
-        
-        # Extract text from PDF
-        text = pdf_parser.extract_text(temp_file_path)
-        
-        print(f"📄 Extracted {len(text)} characters from PDF")
-        
-        # Run analysis
-        print("🚀 Running multi-agent analysis...")
-        result = await langgraph_agent.analyze_pitch_deck(text)
-        
-        # Send results via email
-        print(f"📤 Sending results to {sender}")
-        email_sent = email_service.send_analysis_results(
-            to_email=sender,
-            company_name=result.get('company_name', 'Unknown'),
-            verification_results=result.get('verification_results', []),
-            questions=result.get('questions', []),
-            summary=result.get('summary', {})
-        )
-        
-        # Clean up
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        
-        if email_sent:
-            print(f"✅ Analysis sent to {sender}")
+
+        # Store the PDF like any upload (deduplicated, evicted with the rest) so
+        # nothing is left behind if the job fails or never runs
+        settings = get_settings()
+        try:
+            stored = await services.upload_store.save_upload(
+                pdf_file,
+                pdf_file.filename,
+                max_bytes=settings.max_upload_mb * 1024 * 1024,
+                chunk_size=settings.upload_chunk_size
+            )
+        except UploadTooLargeError as e:
             return JSONResponse({
-                "status": "success",
-                "message": f"Analysis sent to {sender}"
-            })
-        else:
-            raise HTTPException(status_code=500, detail="Failed to send email")
-            
+                "status": "error",
+                "message": str(e)
+            }, status_code=413)
+
+        job = await services.job_queue.submit("email_analysis", {
+            "file_id": stored.file_id,
+            "pdf_hash": stored.sha256,
+            "sender": sender,
+            "subject": subject
+        })
+
+        print(f"📥 Queued analysis job {job['job_id']} for {sender}")
+        return JSONResponse({
+            "status": "accepted",
+            "message": f"Analysis queued; results will be sent to {sender}",
+            "job_id": job["job_id"]
+        }, status_code=202)
+
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         import traceback
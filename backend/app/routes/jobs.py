@@ -0,0 +1,51 @@
+"""
+Background analysis jobs: submit now, poll for the result
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from app.routes import pitch_deck
+from app.services.container import ServiceContainer, get_services
+from typing import Any, Dict
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def register_jobs(services: ServiceContainer):
+    """Register this module's job handlers with the app's queue"""
+    async def analyze_with_agents_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await pitch_deck.run_agent_analysis(
+            services, payload["file_id"], payload.get("use_cache", True)
+        )
+
+    services.job_queue.register("analyze_with_agents", analyze_with_agents_job)
+
+
+@router.post("/analyze-with-agents/{file_id}", status_code=202)
+async def submit_agent_analysis(
+    file_id: str,
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> Dict:
+    """
+    Queue a LangGraph multi-agent analysis and return immediately.
+    Poll GET /api/jobs/{job_id} for status and the result.
+    """
+    if await services.upload_store.resolve_async(file_id) is None:
+        raise HTTPException(status_code=404, detail="Pitch deck not found")
+
+    job_queue = services.job_queue
+    job = await job_queue.submit("analyze_with_agents", {"file_id": file_id, "use_cache": use_cache})
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['job_id']}",
+        "queue_depth": job_queue.queue_depth()
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, services: ServiceContainer = Depends(get_services)) -> Dict:
+    """Job status; 'result' is set once status is 'succeeded', 'error' if 'failed'"""
+    job = await services.job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
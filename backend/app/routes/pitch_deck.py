@@ -1,41 +1,64 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from app.services.pdf_parser import PDFParser
-from app.services.gemini_service import GeminiService
-from app.services.langgraph_agents import PitchDeckVerificationGraph
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.claim_store import get_claim_store
+from app.services.container import ServiceContainer, get_services
+from app.services.deck_revision import plan_revision
+from app.services.llm_cache import get_llm_cache
+from app.services.metrics import ANALYSES_JOINED
+from app.services.pdf_parser import PDFDocument
+from app.services.storage import UploadTooLargeError, read_sidecar, write_sidecar
 from app.config import get_settings
-import os
-import uuid
-from typing import Dict, List
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
 router = APIRouter(prefix="/api/pitch-deck", tags=["pitch-deck"])
 
-pdf_parser = PDFParser()
-gemini_service = GeminiService()
-langgraph_agent = PitchDeckVerificationGraph()
-
 
 @router.post("/upload")
-async def upload_pitch_deck(file: UploadFile = File(...)) -> Dict:
+async def upload_pitch_deck(
+    file: UploadFile = File(...),
+    services: ServiceContainer = Depends(get_services)
+) -> Dict:
     """Upload a pitch deck PDF for analysis"""
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
     settings = get_settings()
-    os.makedirs(settings.upload_dir, exist_ok=True)
-
-    # Save file with unique ID
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(settings.upload_dir, f"{file_id}.pdf")
+    upload_store = services.upload_store
 
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    # Stream to disk in chunks so memory stays flat for large decks; identical
+    # PDFs are stored once under a new file id each
+    try:
+        stored = await upload_store.save_upload(
+            file,
+            file.filename,
+            max_bytes=settings.max_upload_mb * 1024 * 1024,
+            chunk_size=settings.upload_chunk_size
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    file_id = stored.file_id
 
-    # Extract text from PDF
+    # Extract text from PDF once per distinct deck and keep it next to the blob for the analyze endpoints
     try:
-        text = pdf_parser.extract_text(file_path)
-        structured_info = pdf_parser.extract_structured_info(text)
+        path = upload_store.sidecar_path(stored.sha256)
+        document = await asyncio.to_thread(read_sidecar, path) if stored.deduplicated else None
+        parsed = document is None
+        if parsed:
+            document = await services.pdf_parser.extract_document_async(stored.path)
+        text = document.text
+        structured_info = services.pdf_parser.extract_structured_info(text)
+        document.metadata.update({
+            "filename": file.filename,
+            "sha256": stored.sha256,
+            "size_bytes": stored.size,
+            "page_count": document.page_count,
+            "word_count": structured_info["word_count"]
+        })
+        if parsed:
+            await asyncio.to_thread(write_sidecar, path, document)
+        await services.results_store.put_deck(file_id, document.metadata)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing PDF: {str(e)}")
 
@@ -44,24 +67,132 @@ async def upload_pitch_deck(file: UploadFile = File(...)) -> Dict:
         "filename": file.filename,
         "text_preview": text[:500] + "..." if len(text) > 500 else text,
         "word_count": structured_info["word_count"],
+        "page_count": document.page_count,
         "message": "Pitch deck uploaded successfully"
     }
 
 
+async def load_document(services: ServiceContainer, file_id: str) -> PDFDocument:
+    """
+    Load an uploaded deck's extracted text from its sidecar.
+    Decks uploaded before sidecars existed are parsed once and the sidecar written.
+    """
+    upload_store = services.upload_store
+    stored = await upload_store.resolve_async(file_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Pitch deck not found")
+
+    path = upload_store.sidecar_path(stored.sha256)
+    document = await asyncio.to_thread(read_sidecar, path)
+    if document is None:
+        document = await services.pdf_parser.extract_document_async(stored.path)
+        document.metadata["sha256"] = stored.sha256
+        document.metadata["page_count"] = document.page_count
+        await asyncio.to_thread(write_sidecar, path, document)
+        await services.results_store.put_deck(file_id, document.metadata)
+    return document
+
+
+async def record_analysis(
+    services: ServiceContainer,
+    file_id: str,
+    method: str,
+    run: Callable[[], Awaitable[Dict]]
+) -> Dict:
+    """Run an analysis and record its outcome in the results store, so any worker can serve it"""
+    store = services.results_store
+    await store.start_analysis(file_id, method)
+    try:
+        result = await run()
+    except asyncio.CancelledError:
+        # Don't hold up cancellation on the write, but don't leave the run marked as running
+        asyncio.ensure_future(store.finish_analysis(file_id, method, error="Analysis was cancelled"))
+        raise
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        await store.finish_analysis(file_id, method, error=str(detail))
+        raise
+    await store.finish_analysis(file_id, method, result=result)
+    return result
+
+
+async def join_or_run(services: ServiceContainer, key: Tuple, run: Callable[[], Awaitable[Dict]]) -> Dict:
+    """
+    Run an analysis, or attach to the identical one (same deck content, kind
+    and model) already running, so a double-clicked Analyze, a retry or the
+    same deck arriving by email costs one workflow. Keys are (kind, pdf_hash, ...).
+    """
+    result, joined = await services.analyses_in_flight.do(key, lambda: _pinned(services, key[1], run))
+    if joined:
+        print(f"🔗 Attached to the {key[0]} analysis already running for this deck")
+        ANALYSES_JOINED.inc(method=key[0])
+    return result
+
+
+async def _pinned(services: ServiceContainer, pdf_hash: str, run: Callable[[], Awaitable[Dict]]) -> Dict:
+    """Run with the deck's blob kept out of upload eviction"""
+    with services.upload_store.pinned(pdf_hash):
+        return await run()
+
+
+def _record_when_done(services: ServiceContainer, file_id: str, method: str, task: asyncio.Task):
+    """Record a shared run's outcome for file_id once it ends, whether or not anyone still waits on it"""
+    store = services.results_store
+
+    def done(finished: asyncio.Task):
+        if finished.cancelled():
+            write = store.finish_analysis(file_id, method, error="Analysis was cancelled")
+        elif finished.exception() is not None:
+            write = store.finish_analysis(file_id, method, error=str(finished.exception()))
+        else:
+            result = {**finished.result(), "file_id": file_id, "cached": False}
+            write = store.finish_analysis(file_id, method, result=result)
+        asyncio.ensure_future(write)
+    task.add_done_callback(done)
+
+
 @router.post("/analyze/{file_id}")
-async def analyze_pitch_deck(file_id: str) -> Dict:
+async def analyze_pitch_deck(
+    file_id: str,
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> Dict:
     """Analyze pitch deck: extract claims, verify them, and generate questions"""
-    settings = get_settings()
-    file_path = os.path.join(settings.upload_dir, f"{file_id}.pdf")
+    document = await load_document(services, file_id)
+    return await record_analysis(
+        services, file_id, "gemini", lambda: _run_gemini_analysis(services, file_id, document, use_cache)
+    )
+
+
+async def _run_gemini_analysis(
+    services: ServiceContainer,
+    file_id: str,
+    document: PDFDocument,
+    use_cache: bool
+) -> Dict:
+    gemini_service = services.gemini_service
+    result_cache = services.result_cache
+
+    # Return the stored analysis if this exact deck was analyzed before
+    pdf_hash = document.metadata["sha256"]
+    model_name = gemini_service.llm.model_name
+    if use_cache:
+        cached = await result_cache.get(pdf_hash, "gemini", model_name)
+        if cached is not None:
+            return {**cached, "file_id": file_id, "cached": True}
+
+    result = await join_or_run(
+        services, ("gemini", pdf_hash, model_name), lambda: _gemini_workflow(services, document)
+    )
+    return {**result, "file_id": file_id, "cached": False}
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Pitch deck not found")
 
-    # Extract text
-    text = pdf_parser.extract_text(file_path)
+async def _gemini_workflow(services: ServiceContainer, document: PDFDocument) -> Dict:
+    gemini_service = services.gemini_service
+    text = document.text
 
     # Step 1: Extract claims
-    claims = await gemini_service.extract_claims(text)
+    claims = await gemini_service.extract_claims(text, document.pages)
 
     # Step 2: Verify top claims (limit to avoid rate limits)
     verification_results = []
@@ -70,10 +201,9 @@ async def analyze_pitch_deck(file_id: str) -> Dict:
         verification_results.append(result)
 
     # Step 3: Generate questions
-    questions = await gemini_service.generate_questions(text, verification_results)
+    questions = await gemini_service.generate_questions(claims, verification_results)
 
-    return {
-        "file_id": file_id,
+    result = {
         "claims": claims,
         "verification_results": verification_results,
         "questions": questions,
@@ -83,10 +213,16 @@ async def analyze_pitch_deck(file_id: str) -> Dict:
             "questions_generated": len(questions)
         }
     }
+    await services.result_cache.set(document.metadata["sha256"], "gemini", gemini_service.llm.model_name, result)
+    return result
 
 
 @router.post("/analyze-with-agents/{file_id}")
-async def analyze_with_agents(file_id: str) -> Dict:
+async def analyze_with_agents(
+    file_id: str,
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> Dict:
     """
     🚀 ADVANCED: Analyze pitch deck using LangGraph Multi-Agent Workflow
 
@@ -102,22 +238,85 @@ async def analyze_with_agents(file_id: str) -> Dict:
     - Market data lookup
     - Team credential verification
     - Competitor analysis
+
+    Results are cached by PDF content; pass use_cache=false to force a fresh run.
+    For long runs, submit through POST /api/jobs/analyze-with-agents/{file_id} instead.
     """
-    settings = get_settings()
-    file_path = os.path.join(settings.upload_dir, f"{file_id}.pdf")
+    try:
+        return await run_agent_analysis(services, file_id, use_cache)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Agent workflow failed: {str(e)}"
+        )
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Pitch deck not found")
 
-    # Extract text
-    text = pdf_parser.extract_text(file_path)
+async def run_agent_analysis(services: ServiceContainer, file_id: str, use_cache: bool = True) -> Dict:
+    """Run the multi-agent workflow for an uploaded deck, serving cached results when possible"""
+    document = await load_document(services, file_id)
+    return await record_analysis(
+        services, file_id, "langgraph", lambda: _run_langgraph_analysis(services, file_id, document, use_cache)
+    )
 
-    # Run LangGraph multi-agent workflow
-    try:
-        result = await langgraph_agent.analyze_pitch_deck(text)
-        result['file_id'] = file_id
+
+async def _run_langgraph_analysis(
+    services: ServiceContainer,
+    file_id: str,
+    document: PDFDocument,
+    use_cache: bool
+) -> Dict:
+    langgraph_agent = services.langgraph_agent
+    result_cache = services.result_cache
+
+    pdf_hash = document.metadata["sha256"]
+    if use_cache:
+        cached = await result_cache.get(pdf_hash, "langgraph", langgraph_agent.model_name)
+        if cached is not None:
+            return {**cached, "file_id": file_id, "cached": True}
+
+    result = await shared_agent_analysis(services, document)
+    return {**result, "file_id": file_id, "cached": False}
+
+
+async def shared_agent_analysis(services: ServiceContainer, document: PDFDocument) -> Dict:
+    """Run the multi-agent workflow on a deck and cache the result, or attach to the run already going for it"""
+    langgraph_agent = services.langgraph_agent
+    pdf_hash = document.metadata["sha256"]
+
+    async def run() -> Dict:
+        result = await langgraph_agent.analyze_pitch_deck(document.text, document.pages)
         result['method'] = 'langgraph_multi_agent'
+        await services.result_cache.set(pdf_hash, "langgraph", langgraph_agent.model_name, result)
         return result
+
+    return await join_or_run(services, _agent_key(services, pdf_hash), run)
+
+
+def _agent_key(services: ServiceContainer, pdf_hash: str) -> Tuple:
+    """In-flight key shared by the multi-agent endpoints, the stream and the email path"""
+    return ("langgraph", pdf_hash, services.langgraph_agent.model_name)
+
+
+@router.post("/analyze-revision/{file_id}")
+async def analyze_revision(
+    file_id: str,
+    previous_file_id: str,
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> Dict:
+    """
+    Re-analyze a new version of a deck against the multi-agent analysis of an
+    earlier version: pages are diffed, claims are only extracted from changed
+    pages, verdicts for claims that were verified before are reused, and the
+    result (same payload as /analyze-with-agents) gains a "revision" section
+    with the page and claim differences.
+    """
+    try:
+        return await run_revision_analysis(services, file_id, previous_file_id, use_cache)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -125,6 +324,192 @@ async def analyze_with_agents(file_id: str) -> Dict:
         )
 
 
+async def run_revision_analysis(
+    services: ServiceContainer,
+    file_id: str,
+    previous_file_id: str,
+    use_cache: bool = True
+) -> Dict:
+    """Analyze a deck incrementally from the stored analysis of its previous version"""
+    document = await load_document(services, file_id)
+    try:
+        previous_document = await load_document(services, previous_file_id)
+    except HTTPException:
+        raise HTTPException(status_code=404, detail="Previous version of the pitch deck not found")
+    previous = (await services.results_store.get_analyses(previous_file_id)).get("langgraph")
+    if previous is None or previous["result"] is None:
+        raise HTTPException(
+            status_code=409,
+            detail="The previous version has no completed multi-agent analysis; analyze it first"
+        )
+
+    return await record_analysis(
+        services, file_id, "langgraph",
+        lambda: _run_revision_analysis(services, file_id, document, previous_file_id, previous_document, previous, use_cache)
+    )
+
+
+async def _run_revision_analysis(
+    services: ServiceContainer,
+    file_id: str,
+    document: PDFDocument,
+    previous_file_id: str,
+    previous_document: PDFDocument,
+    previous: Dict[str, Any],
+    use_cache: bool
+) -> Dict:
+    langgraph_agent = services.langgraph_agent
+    result_cache = services.result_cache
+    pdf_hash = document.metadata["sha256"]
+    if use_cache:
+        cached = await result_cache.get(pdf_hash, "langgraph", langgraph_agent.model_name)
+        if cached is not None:
+            return {**cached, "file_id": file_id, "cached": True}
+
+    async def run() -> Dict:
+        plan = plan_revision(
+            previous_file_id, previous_document.pages, previous["result"], document.pages, previous["finished_at"]
+        )
+        if plan is None:
+            print("⚠️  Previous analysis has no page attribution; running a full analysis")
+        result = await langgraph_agent.analyze_pitch_deck(document.text, document.pages, revision=plan)
+        result['method'] = 'langgraph_multi_agent'
+        # The merged result is a full analysis of this deck; the diff only makes sense for this request
+        await result_cache.set(
+            pdf_hash, "langgraph", langgraph_agent.model_name,
+            {key: value for key, value in result.items() if key != "revision"}
+        )
+        return result
+
+    # Keyed on both versions' content: the diff differs per previous version
+    key = ("revision", pdf_hash, previous_document.metadata["sha256"], langgraph_agent.model_name)
+    result = await join_or_run(services, key, run)
+    return {**result, "file_id": file_id, "cached": False}
+
+
+@router.get("/analyze-stream/{file_id}")
+async def analyze_with_agents_stream(
+    file_id: str,
+    use_cache: bool = True,
+    services: ServiceContainer = Depends(get_services)
+) -> StreamingResponse:
+    """
+    Run the multi-agent workflow and stream progress as Server-Sent Events.
+
+    Events: chunk_extracted (one per deck chunk), claims_extracted,
+    claim_researched (one per claim), research_complete,
+    claim_verified (one per claim), verification_complete, questions_generated,
+    then complete with the full result. A failure ends the stream with an error event.
+
+    If the same deck is already being analyzed (by another stream or the
+    analyze endpoints), this stream attaches to that run: it gets a joined
+    event instead of progress events, then the shared result. A client that
+    disconnects doesn't stop a run others may be waiting on.
+    """
+    document = await load_document(services, file_id)
+    langgraph_agent = services.langgraph_agent
+    result_cache = services.result_cache
+    pdf_hash = document.metadata["sha256"]
+    cached = None
+    if use_cache:
+        cached = await result_cache.get(pdf_hash, "langgraph", langgraph_agent.model_name)
+
+    results_store = services.results_store
+
+    # Progress events of the run this request starts; None marks the end
+    progress: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> Dict:
+        try:
+            async for event in langgraph_agent.stream_analysis(document.text, document.pages):
+                if event["event"] == "complete":
+                    result = event["result"]
+                    result['method'] = 'langgraph_multi_agent'
+                    await result_cache.set(pdf_hash, "langgraph", langgraph_agent.model_name, result)
+                    return result
+                progress.put_nowait(event)
+            raise RuntimeError("Workflow ended without a result")
+        finally:
+            progress.put_nowait(None)
+
+    async def event_stream():
+        if cached is not None:
+            result = {**cached, "file_id": file_id, "cached": True}
+            await results_store.finish_analysis(file_id, "langgraph", result=result)
+            yield _sse({"event": "complete", "result": result})
+            return
+
+        await results_store.start_analysis(file_id, "langgraph")
+        task, joined = services.analyses_in_flight.start(
+            _agent_key(services, pdf_hash), lambda: _pinned(services, pdf_hash, run)
+        )
+        try:
+            if joined:
+                print("🔗 Attached to the langgraph analysis already running for this deck")
+                ANALYSES_JOINED.inc(method="langgraph")
+                yield _sse({"event": "joined", "detail": "This deck is already being analyzed; waiting for that run"})
+            else:
+                while (event := await progress.get()) is not None:
+                    yield _sse(event)
+            result = {**await asyncio.shield(task), "file_id": file_id, "cached": False}
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client disconnected; the run goes on for anyone attached to it
+            _record_when_done(services, file_id, "langgraph", task)
+            raise
+        except Exception as e:
+            await results_store.finish_analysis(file_id, "langgraph", error=str(e))
+            yield _sse({"event": "error", "detail": f"Agent workflow failed: {str(e)}"})
+            return
+        await results_store.finish_analysis(file_id, "langgraph", result=result)
+        yield _sse({"event": "complete", "result": result})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/results/{file_id}")
+async def get_results(file_id: str, services: ServiceContainer = Depends(get_services)) -> Dict:
+    """
+    A deck's metadata and the latest analysis of each kind ("gemini",
+    "langgraph"), whichever worker ran them. Each analysis has a status of
+    running, succeeded or failed; a failed re-run keeps the last good result.
+    """
+    store = services.results_store
+    deck, analyses = await asyncio.gather(store.get_deck(file_id), store.get_analyses(file_id))
+    if deck is None and not analyses:
+        raise HTTPException(status_code=404, detail="No results for this pitch deck")
+    return {"file_id": file_id, "deck": deck, "analyses": analyses}
+
+
+def _sse(event: Dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/cache/stats")
+async def cache_stats(services: ServiceContainer = Depends(get_services)) -> Dict:
+    """Hit/miss counters for the LLM, search, verified-claim and analysis result caches"""
+    llm_cache = get_llm_cache()
+    claim_store = get_claim_store()
+    search_stats = (
+        {**services.langgraph_agent.tools.get_cache_stats(),
+         "coalescing": services.langgraph_agent.tools.inflight.stats()}
+        if services.is_loaded("langgraph_agent") else {}
+    )
+    return {
+        "llm": llm_cache.stats() if llm_cache is not None else {"enabled": False},
+        "search": search_stats,
+        "claims": await asyncio.to_thread(claim_store.stats) if claim_store is not None else {"enabled": False},
+        "results": await asyncio.to_thread(services.result_cache.store.stats),
+        "results_store": await services.results_store.stats(),
+        "uploads": await asyncio.to_thread(services.upload_store.stats),
+        "analyses_in_flight": services.analyses_in_flight.stats()
+    }
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
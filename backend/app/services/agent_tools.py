@@ -3,17 +3,113 @@ LangChain Tools for pitch deck verification agents
 """
 from langchain_core.tools import Tool
 from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+from contextvars import ContextVar, Token
 from typing import Dict, List, Optional
+from app.config import get_settings
+from app.services.batch import current_batch
+from app.services.fake_backends import FakeSearch, load_canned_responses
+from app.services.metrics import record_tool_call
+from app.services.rate_limiter import backoff_delay, get_search_limiter, is_retryable
+from app.services.search_cache import SearchCache
+from app.services.singleflight import SingleFlight
 import requests
+import time
 from bs4 import BeautifulSoup
 import json
 
 
+# Searches made by the current analysis, so repeated queries within it run once
+_request_searches: ContextVar[Optional[SingleFlight]] = ContextVar("request_searches", default=None)
+
+
+def start_request_searches() -> Token:
+    """Share identical searches across the rest of the current analysis"""
+    return _request_searches.set(SingleFlight(keep_results=True))
+
+
+def finish_request_searches(token: Token):
+    try:
+        _request_searches.reset(token)
+    except ValueError:
+        # Reset from another context (e.g. an async generator closed elsewhere); the var dies with it
+        pass
+
+
 class VerificationTools:
     """Collection of tools for pitch deck verification"""
 
     def __init__(self):
-        self.search = DuckDuckGoSearchAPIWrapper()
+        settings = get_settings()
+        if settings.search_backend == "fake":
+            self.search = FakeSearch(
+                latency=settings.fake_search_latency,
+                error_rate=settings.fake_error_rate,
+                response=load_canned_responses(settings.fake_responses_file).get("search"),
+                seed=settings.fake_seed
+            )
+        else:
+            self.search = DuckDuckGoSearchAPIWrapper()
+        self.cache = SearchCache() if settings.search_cache_enabled else None
+        self.limiter = get_search_limiter()
+        self.max_retries = max(1, settings.search_max_retries)
+        self.retry_base_delay = settings.search_retry_base_delay
+        # Identical searches in flight at once, from any analysis, share one call
+        self.inflight = SingleFlight()
+
+    def _search(self, tool: str, query: str) -> str:
+        """
+        Run a search, serving repeated queries from the cache.
+        Identical queries are coalesced: within one analysis (or one batch) a
+        query runs once, and concurrent analyses share a query in flight.
+        Live searches wait on the shared rate limiter and are retried with
+        backoff when DuckDuckGo rate-limits or times out.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(tool, query)
+            if cached is not None:
+                record_tool_call(tool, "cache_hit")
+                return cached
+
+        key = (tool, SearchCache.normalize_query(query))
+
+        def run() -> str:
+            results, shared = self.inflight.do(key, lambda: self._live_search(tool, query))
+            if shared:
+                record_tool_call(tool, "coalesced")
+            return results
+
+        batch = current_batch()
+        scope = batch.searches if batch is not None else _request_searches.get()
+        if scope is None:
+            return run()
+        results, shared = scope.do(key, run)
+        if shared:
+            record_tool_call(tool, "coalesced")
+        return results
+
+    def _live_search(self, tool: str, query: str) -> str:
+        start = time.perf_counter()
+        for attempt in range(1, self.max_retries + 1):
+            self.limiter.acquire_blocking()
+            try:
+                results = self.search.run(query)
+                break
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    record_tool_call(tool, "error", time.perf_counter() - start)
+                    raise
+                delay = backoff_delay(attempt, self.retry_base_delay)
+                print(f"⚠️  Search attempt {attempt} failed ({type(e).__name__}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+        record_tool_call(tool, "ok", time.perf_counter() - start)
+
+        if self.cache is not None:
+            self.cache.set(tool, query, results)
+        return results
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Search cache hit/miss counters per tool"""
+        return self.cache.stats() if self.cache is not None else {}
 
     def web_search(self, query: str) -> str:
         """
@@ -21,7 +117,7 @@ class VerificationTools:
         Useful for finding recent news, market data, and company information.
         """
         try:
-            results = self.search.run(query)
+            results = self._search("web_search", query)
             return results
         except Exception as e:
             return f"Search failed: {str(e)}"
@@ -33,7 +129,7 @@ class VerificationTools:
         """
         query = f"{company_name} funding crunchbase startup"
         try:
-            results = self.search.run(query)
+            results = self._search("search_company_info", query)
             return f"Company Information for {company_name}:\n{results}"
         except Exception as e:
             return f"Company search failed: {str(e)}"
@@ -45,7 +141,7 @@ class VerificationTools:
         """
         query = f"{market_query} market size TAM SAM statistics gartner statista"
         try:
-            results = self.search.run(query)
+            results = self._search("search_market_data", query)
             return f"Market Data:\n{results}"
         except Exception as e:
             return f"Market search failed: {str(e)}"
@@ -57,7 +153,7 @@ class VerificationTools:
         """
         query = f"{person_name} {company} linkedin background experience"
         try:
-            results = self.search.run(query)
+            results = self._search("search_person", query)
             return f"Person Information for {person_name}:\n{results}"
         except Exception as e:
             return f"Person search failed: {str(e)}"
@@ -69,7 +165,7 @@ class VerificationTools:
         """
         query = f"{technology_claim} benchmark industry standard performance"
         try:
-            results = self.search.run(query)
+            results = self._search("search_technology", query)
             return f"Technology Benchmarks:\n{results}"
         except Exception as e:
             return f"Technology search failed: {str(e)}"
@@ -81,7 +177,7 @@ class VerificationTools:
         """
         query = f"{competitor_name} {sector} revenue funding market share"
         try:
-            results = self.search.run(query)
+            results = self._search("analyze_competitor", query)
             return f"Competitor Analysis for {competitor_name}:\n{results}"
         except Exception as e:
             return f"Competitor search failed: {str(e)}"
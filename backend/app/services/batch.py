@@ -0,0 +1,67 @@
+"""
+Work shared across the decks of one batch analysis
+
+Decks in a batch often repeat each other: the same market-size figure, the
+same competitor, the same founder. While a batch runs, identical searches and
+identical claims are researched once, whether the first run is still in
+flight or already finished, and every deck that needs them waits on that run.
+"""
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional
+from app.services.singleflight import SingleFlight
+
+
+class BatchScope:
+    """In-flight and finished searches and claim research for one batch"""
+
+    def __init__(self):
+        # Searches run in worker threads; see VerificationTools._search
+        self.searches = SingleFlight(keep_results=True)
+        self._research: Dict[Hashable, asyncio.Task] = {}
+        self.research_run = 0
+        self.research_shared = 0
+
+    def start(self, coro: Coroutine) -> asyncio.Task:
+        """Start a task that runs inside this batch"""
+        token = _current_batch.set(self)
+        try:
+            return asyncio.create_task(coro)
+        finally:
+            _current_batch.reset(token)
+
+    async def research(self, key: Hashable, run: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Research a claim once per key. The shared run is shielded, so a deck
+        that gives up on it (or is cancelled) does not cancel it for the others.
+        """
+        task = self._research.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = self._research[key] = asyncio.ensure_future(run())
+            self.research_run += 1
+        else:
+            self.research_shared += 1
+        return dict(await asyncio.shield(task))
+
+    def close(self):
+        """Cancel research nobody is waiting for any more (e.g. after a client disconnects)"""
+        for task in self._research.values():
+            if not task.done():
+                task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        searches = self.searches.stats()
+        return {
+            "searches_run": searches["runs"],
+            "searches_shared": searches["shared"],
+            "research_run": self.research_run,
+            "research_shared": self.research_shared,
+        }
+
+
+_current_batch: ContextVar[Optional[BatchScope]] = ContextVar("batch_scope", default=None)
+
+
+def current_batch() -> Optional[BatchScope]:
+    """The batch the current task belongs to, if any"""
+    return _current_batch.get()
@@ -0,0 +1,212 @@
+"""
+Key/value caches: persistent SQLite store and an in-process LRU tier
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# A hit only moves an entry up the LRU order when its last recorded access is
+# older than this (or a tenth of the TTL, if shorter); touches are written in batches
+TOUCH_INTERVAL_SECONDS = 60
+TOUCH_BATCH = 64
+
+
+class DiskCache:
+    """
+    SQLite-backed string cache with per-entry TTL and size-bounded LRU eviction.
+    Safe to share between threads; several processes may open the same file.
+    """
+
+    def __init__(self, path: str, max_bytes: int, default_ttl: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.touch_interval = (
+            min(TOUCH_INTERVAL_SECONDS, default_ttl / 10) if default_ttl else TOUCH_INTERVAL_SECONDS
+        )
+        # accessed_at updates not yet written, by key
+        self._touches: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if it is missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                self._touches.pop(key, None)
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            # Plain reads don't write; LRU order only needs to be roughly right
+            if now - self._touches.get(key, accessed_at) >= self.touch_interval:
+                self._touches[key] = now
+                if len(self._touches) >= TOUCH_BATCH:
+                    self._flush_touches()
+                    self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a value, then evict expired and least recently used entries"""
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        size = len(value.encode("utf-8"))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, expires_at, now)
+            )
+            self._touches.pop(key, None)
+            # Eviction should see recent hits
+            self._flush_touches()
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._touches.pop(key, None)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._touches.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": entries, "bytes": total_bytes, "max_bytes": self.max_bytes}
+
+    def _flush_touches(self):
+        """Write pending accessed_at updates; the caller commits"""
+        if self._touches:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touches.items()]
+            )
+            self._touches.clear()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used until under max_bytes"""
+        self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        (total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if total_bytes <= self.max_bytes:
+            return
+
+        to_delete = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        ):
+            if total_bytes <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total_bytes -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+
+
+class MemoryLRU:
+    """In-process LRU of string values with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    Two-tier cache: a small in-process LRU in front of a shared DiskCache.
+    Disk hits are promoted into memory.
+    """
+
+    MEMORY = "memory"
+    DISK = "disk"
+
+    # How long a value promoted from disk stays in memory before disk is consulted again
+    PROMOTED_TTL = 300
+
+    def __init__(self, memory: MemoryLRU, disk: DiskCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (value, tier) where tier is 'memory', 'disk' or None on a miss"""
+        value = self.memory.get(key)
+        if value is not None:
+            return value, self.MEMORY
+
+        value = self.disk.get(key)
+        if value is not None:
+            # The disk TTL is authoritative; keep the memory copy briefly
+            self.memory.set(key, value, time.time() + self.PROMOTED_TTL)
+            return value, self.DISK
+
+        return None, None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self.memory.set(key, value, time.time() + ttl if ttl else None)
+        self.disk.set(key, value, ttl)
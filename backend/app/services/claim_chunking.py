@@ -0,0 +1,150 @@
+"""
+Map-reduce helpers for claim extraction over a whole deck
+
+Decks are packed into page-aligned chunks of bounded size, each chunk is sent
+to the extractor on its own (in parallel), and the per-chunk claims are merged
+back into one deduplicated list.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+# Claim priority: most important first
+IMPORTANCE_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+@dataclass
+class DeckChunk:
+    text: str
+    first_page: int
+    last_page: int
+
+    @property
+    def label(self) -> str:
+        if self.first_page == self.last_page:
+            return f"page {self.first_page}"
+        return f"pages {self.first_page}-{self.last_page}"
+
+
+def _split_long_page(text: str, max_chars: int) -> List[str]:
+    """Split one oversized page on line boundaries (hard-splitting very long lines)"""
+    pieces: List[str] = []
+    current = ""
+    for line in text.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = candidate
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def chunk_pages(pages: List[str], max_chars: int) -> List[DeckChunk]:
+    """
+    Greedily pack consecutive pages into chunks of at most max_chars.
+    A page is only split when it alone exceeds max_chars, in which case it
+    gets chunks of its own. Page numbers are 1-based.
+    """
+    chunks: List[DeckChunk] = []
+    current: List[str] = []
+    first_page = last_page = 1
+    size = 0
+
+    def flush():
+        nonlocal current, size
+        if current:
+            chunks.append(DeckChunk("\n".join(current), first_page, last_page))
+        current, size = [], 0
+
+    for page_number, page in enumerate(pages, 1):
+        if not page.strip():
+            continue
+        if len(page) > max_chars:
+            flush()
+            for piece in _split_long_page(page, max_chars):
+                chunks.append(DeckChunk(piece, page_number, page_number))
+            continue
+        if current and size + len(page) + 1 > max_chars:
+            flush()
+        if not current:
+            first_page = page_number
+        current.append(page)
+        last_page = page_number
+        size += len(page) + 1
+    flush()
+    return chunks
+
+
+_NON_WORD = re.compile(r"[^a-z0-9$%.]+")
+
+
+def normalize_claim(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace for duplicate detection"""
+    words = _NON_WORD.sub(" ", text.lower()).split()
+    return " ".join(word.strip(".") for word in words if word.strip("."))
+
+
+def similar_claims(a: set, b: set, threshold: float) -> bool:
+    """Jaccard overlap of two word sets; claims quoting different figures never match"""
+    if not a or not b:
+        return False
+    if {w for w in a if any(ch.isdigit() for ch in w)} != {w for w in b if any(ch.isdigit() for ch in w)}:
+        return False
+    return len(a & b) / len(a | b) >= threshold
+
+
+def merge_claims(
+    chunk_claims: List[List[Dict[str, Any]]],
+    chunks: Optional[List[DeckChunk]] = None,
+    similarity: float = 0.8
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-chunk claim lists in deck order, dropping duplicates.
+    Claims are duplicates when they quote the same figures and their
+    normalized word sets overlap by at least `similarity` (Jaccard); the
+    merged claim keeps the first wording, the highest importance, and the
+    pages it was seen on (source_pages) when chunks are given.
+    """
+    merged: List[Dict[str, Any]] = []
+    signatures: List[set] = []
+
+    for index, claims in enumerate(chunk_claims):
+        chunk = chunks[index] if chunks else None
+        for claim in claims:
+            if not isinstance(claim, dict) or not str(claim.get("claim", "")).strip():
+                continue
+            words = set(normalize_claim(str(claim["claim"])).split())
+            match = next(
+                (i for i, seen in enumerate(signatures) if similar_claims(words, seen, similarity)),
+                None
+            )
+            if match is None:
+                claim = dict(claim)
+                if chunk is not None:
+                    claim["source_pages"] = [chunk.first_page, chunk.last_page]
+                merged.append(claim)
+                signatures.append(words)
+                continue
+
+            existing = merged[match]
+            rank = IMPORTANCE_RANK.get(str(claim.get("importance", "")).lower(), len(IMPORTANCE_RANK))
+            if rank < IMPORTANCE_RANK.get(str(existing.get("importance", "")).lower(), len(IMPORTANCE_RANK)):
+                existing["importance"] = claim["importance"]
+            if claim.get("needs_verification"):
+                existing["needs_verification"] = True
+            if chunk is not None and "source_pages" in existing:
+                existing["source_pages"] = [
+                    min(existing["source_pages"][0], chunk.first_page),
+                    max(existing["source_pages"][1], chunk.last_page)
+                ]
+    return merged
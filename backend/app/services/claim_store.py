@@ -0,0 +1,283 @@
+"""
+Cross-deck store of verified claims
+
+The same market statistics and competitor facts show up in many decks. Each
+finished verification is kept under a canonical form of its claim (lowercased,
+numbers and magnitudes normalized), so a later deck can reuse it instead of
+researching and verifying it again. Near-duplicate wordings are found with a
+MinHash/LSH index over the claim's words. Claims whose verification depends on
+the company (team, revenue, traction) are stored under a scope naming it, so
+they are only reused for that company.
+"""
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from app.config import get_settings
+from app.services.claim_chunking import similar_claims
+
+
+_MAGNITUDES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mn": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "t": 1e12, "tn": 1e12, "trillion": 1e12,
+}
+_CURRENCIES = {"$": "usd", "usd": "usd", "dollars": "usd", "€": "eur", "eur": "eur", "£": "gbp", "gbp": "gbp"}
+_NUMBER = re.compile(
+    r"(?P<cur>[$€£])?\s*(?P<num>\d+(?:,\d{3})*(?:\.\d+)?)\s*"
+    r"(?P<unit>thousand|million|billion|trillion|percent|mm|mn|bn|tn|k|m|b|t|%)?(?![a-z0-9])"
+    r"(?:\s*(?P<cur_after>dollars|usd|eur|gbp)(?![a-z]))?"
+)
+
+
+def _canonical_number(match: re.Match) -> str:
+    value = float(match.group("num").replace(",", ""))
+    unit = match.group("unit")
+    if unit in ("%", "percent"):
+        return f" {value:g}pct "
+    value *= _MAGNITUDES.get(unit, 1)
+    number = f"{value:.6g}".replace("e+0", "e").replace("e+", "e")
+    currency = _CURRENCIES.get(match.group("cur") or match.group("cur_after") or "", "")
+    return f" {currency}{number} "
+
+
+def canonicalize_claim(text: str) -> str:
+    """
+    Canonical form used to index claims: lowercase, numbers with their
+    magnitude folded in ("$50B", "$50 billion" and "50,000,000,000 dollars"
+    all become "usd5e10"), percentages as "25pct", punctuation dropped.
+    """
+    text = _NUMBER.sub(_canonical_number, text.lower())
+    words = re.sub(r"[^a-z0-9.]+", " ", text).split()
+    return " ".join(word.strip(".") for word in words if word.strip("."))
+
+
+class MinHasher:
+    """MinHash signatures over a claim's words, split into LSH bands"""
+
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, bands: int = 8, rows: int = 4, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._params = [
+            (rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME))
+            for _ in range(bands * rows)
+        ]
+
+    def band_keys(self, words: set) -> List[str]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+            for word in words
+        ]
+        if not hashes:
+            return []
+        signature = [min((a * h + b) % self.PRIME for h in hashes) for a, b in self._params]
+        return [
+            f"{band}:" + hashlib.blake2b(
+                repr(signature[band * self.rows:(band + 1) * self.rows]).encode(), digest_size=8
+            ).hexdigest()
+            for band in range(self.bands)
+        ]
+
+
+class VerifiedClaimStore:
+    """
+    SQLite store of past claim verifications, shared across decks.
+    Safe to share between threads; several processes may open the same file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age: float,
+        near_duplicates: bool = True,
+        similarity: float = 0.8
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_age = max_age
+        self.near_duplicates = near_duplicates
+        self.similarity = similarity
+        self.hasher = MinHasher()
+        self._lock = threading.Lock()
+        self._counts = {"exact_hits": 0, "near_hits": 0, "misses": 0}
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS claims (
+                key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL DEFAULT '',
+                canonical TEXT NOT NULL,
+                claim TEXT NOT NULL,
+                category TEXT,
+                verification_result TEXT NOT NULL,
+                research_summary TEXT,
+                source TEXT,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                verified_at REAL NOT NULL,
+                reuse_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS claim_bands (
+                band TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (band, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_claims_verified ON claims (verified_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_claim_bands_key ON claim_bands (key)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(canonical: str, model_name: str, prompt_version: str, scope: str = "") -> str:
+        digest = hashlib.sha256(f"{scope}\n{canonical}".encode("utf-8")).hexdigest()
+        return f"{model_name}:{prompt_version}:{digest}"
+
+    @staticmethod
+    def company_scope(company_name: Optional[str]) -> str:
+        """Scope for claims verified against one company's own record"""
+        return "company:" + " ".join((company_name or "").lower().split())
+
+    def lookup(
+        self,
+        claim: str,
+        model_name: str,
+        prompt_version: str,
+        scope: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh stored verification for this claim within scope, or None.
+        The result carries provenance: the stored claim wording, the company it
+        was verified for, when, and whether it matched exactly or as a near duplicate.
+        """
+        canonical = canonicalize_claim(claim)
+        if not canonical:
+            return None
+        now = time.time()
+        oldest = now - self.max_age
+        key = self.make_key(canonical, model_name, prompt_version, scope)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM claims WHERE key = ? AND verified_at > ?", (key, oldest)
+            ).fetchone()
+            match, similarity = "exact", 1.0
+
+            if row is None and self.near_duplicates:
+                words = set(canonical.split())
+                bands = self.hasher.band_keys(words)
+                candidates = self._conn.execute(
+                    f"SELECT c.* FROM claims c WHERE c.key IN ("
+                    f"SELECT key FROM claim_bands WHERE band IN ({','.join('?' * len(bands))})"
+                    f") AND c.scope = ? AND c.model = ? AND c.prompt_version = ? AND c.verified_at > ?",
+                    (*bands, scope, model_name, prompt_version, oldest)
+                ).fetchall()
+                best = None
+                for candidate in candidates:
+                    seen = set(candidate[2].split())
+                    if similar_claims(words, seen, self.similarity):
+                        score = len(words & seen) / len(words | seen)
+                        if best is None or score > best[1]:
+                            best = (candidate, score)
+                if best is not None:
+                    row, similarity = best
+                    match = "near"
+
+            if row is None:
+                self._counts["misses"] += 1
+                return None
+
+            self._counts["exact_hits" if match == "exact" else "near_hits"] += 1
+            self._conn.execute("UPDATE claims SET reuse_count = reuse_count + 1 WHERE key = ?", (row[0],))
+            self._conn.commit()
+
+        return {
+            "claim": row[3],
+            "category": row[4],
+            "verification_result": row[5],
+            "research_summary": row[6],
+            "source": row[7],
+            "verified_at": row[10],
+            "age_seconds": round(now - row[10]),
+            "match": match,
+            "similarity": round(similarity, 3)
+        }
+
+    def put(
+        self,
+        claim: str,
+        category: Optional[str],
+        verification_result: str,
+        research_summary: str,
+        source: Optional[str],
+        model_name: str,
+        prompt_version: str,
+        scope: str = ""
+    ):
+        """Store (or refresh) a verification, and drop entries older than max_age"""
+        canonical = canonicalize_claim(claim)
+        if not canonical:
+            return
+        now = time.time()
+        key = self.make_key(canonical, model_name, prompt_version, scope)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO claims (key, scope, canonical, claim, category, verification_result, "
+                "research_summary, source, model, prompt_version, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, scope, canonical, claim, category, verification_result, research_summary,
+                 source, model_name, prompt_version, now)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO claim_bands (band, key) VALUES (?, ?)",
+                [(band, key) for band in self.hasher.band_keys(set(canonical.split()))]
+            )
+            self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float):
+        """Drop expired claims and only their band rows; both lookups are indexed"""
+        expired = [(row[0],) for row in self._conn.execute(
+            "SELECT key FROM claims WHERE verified_at <= ?", (now - self.max_age,)
+        )]
+        if expired:
+            self._conn.executemany("DELETE FROM claims WHERE key = ?", expired)
+            self._conn.executemany("DELETE FROM claim_bands WHERE key = ?", expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Stored claims plus hit/miss counters since process start"""
+        with self._lock:
+            counts = dict(self._counts)
+            counts["entries"] = self._conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0]
+        hits = counts["exact_hits"] + counts["near_hits"]
+        lookups = hits + counts["misses"]
+        counts["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return counts
+
+
+@lru_cache()
+def get_claim_store() -> Optional[VerifiedClaimStore]:
+    """Process-wide verified-claim store, or None when CLAIM_STORE_ENABLED is off"""
+    settings = get_settings()
+    if not settings.claim_store_enabled:
+        return None
+    return VerifiedClaimStore(
+        os.path.join(settings.cache_dir, "verified_claims.sqlite3"),
+        max_age=settings.claim_store_max_age_seconds,
+        near_duplicates=settings.claim_store_near_duplicates,
+        similarity=settings.claim_store_similarity
+    )
@@ -0,0 +1,102 @@
+"""
+App-scoped service container
+
+Services are created on first use and shared by every route, so the app holds
+one genai client, one search wrapper and one compiled graph. Heavy modules
+(google-genai, LangChain, LangGraph) are imported only when a service that
+needs them is first requested, which keeps `import app.main` fast.
+"""
+from functools import cached_property
+from typing import TYPE_CHECKING
+from fastapi import Request
+from app.config import get_settings
+import os
+
+if TYPE_CHECKING:
+    from app.services.email_service import EmailService
+    from app.services.gemini_service import GeminiService
+    from app.services.job_queue import JobQueue
+    from app.services.langgraph_agents import PitchDeckVerificationGraph
+    from app.services.pdf_parser import PDFParser
+    from app.services.result_cache import AnalysisResultCache
+    from app.services.results_store import ResultsStore
+    from app.services.singleflight import AsyncSingleFlight
+    from app.services.upload_store import UploadStore
+
+
+class ServiceContainer:
+    """Lazily constructed, app-scoped services"""
+
+    @cached_property
+    def pdf_parser(self) -> "PDFParser":
+        from app.services.pdf_parser import PDFParser
+        return PDFParser()
+
+    @cached_property
+    def gemini_service(self) -> "GeminiService":
+        from app.services.gemini_service import GeminiService
+        return GeminiService()
+
+    @cached_property
+    def langgraph_agent(self) -> "PitchDeckVerificationGraph":
+        from app.services.langgraph_agents import PitchDeckVerificationGraph
+        return PitchDeckVerificationGraph()
+
+    @cached_property
+    def email_service(self) -> "EmailService":
+        from app.services.email_service import EmailService
+        return EmailService()
+
+    @cached_property
+    def result_cache(self) -> "AnalysisResultCache":
+        from app.services.result_cache import AnalysisResultCache
+        return AnalysisResultCache()
+
+    @cached_property
+    def results_store(self) -> "ResultsStore":
+        from app.services.results_store import create_results_store
+        return create_results_store(get_settings())
+
+    @cached_property
+    def analyses_in_flight(self) -> "AsyncSingleFlight":
+        """Running analyses by deck content, so repeated requests attach instead of starting another"""
+        from app.services.singleflight import AsyncSingleFlight
+        return AsyncSingleFlight()
+
+    @cached_property
+    def upload_store(self) -> "UploadStore":
+        from app.services.upload_store import UploadStore
+        settings = get_settings()
+        return UploadStore(
+            settings.upload_dir,
+            quota_bytes=settings.upload_quota_mb * 1024 * 1024,
+            ttl_seconds=settings.upload_ttl_days * 24 * 3600
+        )
+
+    @cached_property
+    def job_queue(self) -> "JobQueue":
+        from app.services.job_queue import JobQueue
+        settings = get_settings()
+        return JobQueue(
+            os.path.join(settings.data_dir, "jobs.sqlite3"),
+            workers=settings.job_workers,
+            retention_seconds=settings.job_retention_seconds,
+            lease_seconds=settings.job_lease_seconds,
+            poll_seconds=settings.job_poll_seconds
+        )
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a service has been created yet"""
+        return name in self.__dict__
+
+    async def aclose(self):
+        """Stop background work and release connections for services that were created"""
+        if self.is_loaded("job_queue"):
+            await self.job_queue.stop()
+        if self.is_loaded("email_service"):
+            await self.email_service.pool.close()
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """FastAPI dependency returning the container created in the app lifespan"""
+    return request.app.state.services
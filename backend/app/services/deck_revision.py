@@ -0,0 +1,212 @@
+"""
+Incremental re-analysis of a revised deck
+
+A new version of a deck is compared page by page with the previous version.
+Each earlier claim is traced to the page that states it; claims on unchanged
+pages carry over (renumbered to their new pages), only changed pages are sent
+to the extractor, and claims already verified for the previous version keep
+their verdicts. Cost scales with the size of the change.
+"""
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from app.services.claim_chunking import normalize_claim, similar_claims
+
+# Claims with the same wording apart from their figures count as "changed"
+CHANGED_CLAIM_SIMILARITY = 0.6
+
+# Share of a claim's words a page must contain (with all its figures) to be its source
+CLAIM_PAGE_OVERLAP = 0.5
+
+
+def page_fingerprint(text: str) -> str:
+    """Hash of a page's text, ignoring case and whitespace"""
+    return hashlib.sha1(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def _words(text: str) -> set:
+    return set(normalize_claim(text).split())
+
+
+def _figures(words: set) -> set:
+    return {word for word in words if re.search(r"\d", word)}
+
+
+def locate_claim(claim_text: str, page_words: List[set], first: int, last: int) -> Optional[int]:
+    """
+    The page in first..last that states the claim: it must quote all of the
+    claim's figures, and the page sharing the most of its words wins
+    """
+    words = _words(claim_text)
+    if not words:
+        return None
+    best, best_score = None, CLAIM_PAGE_OVERLAP
+    for number in range(max(1, first), min(last, len(page_words)) + 1):
+        if not _figures(words) <= page_words[number - 1]:
+            continue
+        score = len(words & page_words[number - 1]) / len(words)
+        if score > best_score:
+            best, best_score = number, score
+    return best
+
+
+@dataclass
+class RevisionPlan:
+    previous_file_id: str
+    company_name: str
+    # New page number -> page number in the previous version, for unchanged pages
+    page_map: Dict[int, int]
+    changed_pages: List[int]
+    removed_pages: List[int]
+    # New page numbers to run claim extraction on
+    extract_pages: Set[int]
+    carried_claims: List[Dict[str, Any]]
+    previous_claims: List[Dict[str, Any]]
+    previous_verifications: List[Dict[str, Any]]
+    verified_at: float = field(default_factory=time.time)
+
+    def pages_to_extract(self, pages: List[str]) -> List[str]:
+        """The deck with every page that needn't be extracted blanked, so page numbers still line up"""
+        return [page if number in self.extract_pages else "" for number, page in enumerate(pages, 1)]
+
+    def previous_verification(self, claim_obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        The previous version's verdict for this claim, shaped like a claim store hit,
+        or None if the claim (with these figures) was not verified before
+        """
+        words = _words(str(claim_obj.get("claim", "")))
+        for verification in self.previous_verifications:
+            if similar_claims(words, _words(verification["claim"]), 0.8):
+                return {
+                    "claim": verification["claim"],
+                    "category": claim_obj.get("category", "other"),
+                    "verification_result": verification["verification_result"],
+                    "research_summary": verification.get("research_summary", ""),
+                    "source": self.previous_file_id,
+                    "verified_at": self.verified_at,
+                    "age_seconds": round(time.time() - self.verified_at),
+                    "match": "revision",
+                    "similarity": 1.0
+                }
+        return None
+
+    def report(self, claims: List[Dict[str, Any]], page_count: int) -> Dict[str, Any]:
+        """Page- and claim-level differences from the previous version"""
+        return {
+            "previous_file_id": self.previous_file_id,
+            "pages": {
+                "total": page_count,
+                "unchanged": len(self.page_map),
+                "changed": self.changed_pages,
+                "removed": self.removed_pages,
+                "extracted": sorted(self.extract_pages)
+            },
+            "claims": claim_diff(self.previous_claims, claims)
+        }
+
+
+def plan_revision(
+    previous_file_id: str,
+    previous_pages: List[str],
+    previous_result: Dict[str, Any],
+    pages: List[str],
+    verified_at: Optional[float] = None
+) -> Optional[RevisionPlan]:
+    """
+    Work out what to re-extract and what to carry over from the previous version's analysis.
+    Returns None if the previous claims have no page attribution (analyses from
+    before claims recorded source_pages), in which case the deck needs a full run.
+    """
+    previous_claims = [c for c in previous_result.get("claims", []) if isinstance(c, dict)]
+    if any("source_pages" not in claim for claim in previous_claims):
+        return None
+
+    # Match pages by content so inserted, removed and reordered slides line up
+    unmatched: Dict[str, List[int]] = {}
+    for number, page in enumerate(previous_pages, 1):
+        unmatched.setdefault(page_fingerprint(page), []).append(number)
+    page_map: Dict[int, int] = {}
+    changed_pages: List[int] = []
+    for number, page in enumerate(pages, 1):
+        candidates = unmatched.get(page_fingerprint(page))
+        if candidates:
+            page_map[number] = candidates.pop(0)
+        elif page.strip():
+            changed_pages.append(number)
+    new_page_of = {old: new for new, old in page_map.items()}
+    removed_pages = [
+        number for number, page in enumerate(previous_pages, 1) if number not in new_page_of and page.strip()
+    ]
+
+    carried: List[Dict[str, Any]] = []
+    extract_pages = set(changed_pages)
+    previous_words = [_words(page) for page in previous_pages]
+    for claim in previous_claims:
+        first, last = claim["source_pages"]
+        page = locate_claim(str(claim.get("claim", "")), previous_words, first, last)
+        # A claim that can't be traced to one page depends on every page of its chunk
+        old_pages = [page] if page is not None else range(first, last + 1)
+        if all(old in new_page_of or not previous_pages[old - 1].strip() for old in old_pages):
+            new_pages = [new_page_of[old] for old in old_pages if old in new_page_of]
+            if new_pages:
+                carried.append({**claim, "source_pages": [min(new_pages), max(new_pages)]})
+            continue
+        # The claim's page changed, or it can't be placed; re-read its unchanged pages too
+        extract_pages.update(new_page_of[old] for old in old_pages if old in new_page_of)
+
+    return RevisionPlan(
+        previous_file_id=previous_file_id,
+        company_name=previous_result.get("company_name") or "Unknown",
+        page_map=page_map,
+        changed_pages=changed_pages,
+        removed_pages=removed_pages,
+        extract_pages=extract_pages,
+        carried_claims=carried,
+        previous_claims=previous_claims,
+        previous_verifications=[
+            v for v in previous_result.get("verification_results", [])
+            if isinstance(v, dict) and v.get("claim") and v.get("verification_result")
+        ],
+        verified_at=verified_at or time.time()
+    )
+
+
+def claim_diff(previous_claims: List[Dict[str, Any]], claims: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare claim lists: claims in both are unchanged, claims reworded only in
+    their figures (same category) are changed, the rest are added or removed
+    """
+    previous = [(claim, _words(str(claim.get("claim", "")))) for claim in previous_claims]
+    current = [(claim, _words(str(claim.get("claim", "")))) for claim in claims]
+
+    unchanged = 0
+    remaining: List[tuple] = []
+    for claim, words in current:
+        match = next((i for i, (_, seen) in enumerate(previous) if similar_claims(words, seen, 0.8)), None)
+        if match is None:
+            remaining.append((claim, words))
+        else:
+            previous.pop(match)
+            unchanged += 1
+
+    changed, added = [], []
+    for claim, words in remaining:
+        plain = words - _figures(words)
+        match = next((
+            i for i, (old, seen) in enumerate(previous)
+            if old.get("category") == claim.get("category")
+            and plain and len(plain & (seen - _figures(seen))) / len(plain | (seen - _figures(seen))) >= CHANGED_CLAIM_SIMILARITY
+        ), None)
+        if match is None:
+            added.append(claim)
+        else:
+            changed.append({"before": previous.pop(match)[0], "after": claim})
+
+    return {
+        "unchanged": unchanged,
+        "changed": changed,
+        "added": added,
+        "removed": [claim for claim, _ in previous]
+    }
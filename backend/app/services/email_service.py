@@ -1,13 +1,90 @@
 """
 Email Service for sending analysis results via Gmail SMTP
 """
-import smtplib
+import aiosmtplib
+import asyncio
+import random
+from contextlib import asynccontextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 from app.config import get_settings
 
 
+class SMTPConnectionPool:
+    """
+    Pool of authenticated aiosmtplib connections.
+    Connections are reused across sends so a burst of emails does not pay for
+    a TCP + STARTTLS + LOGIN handshake each time.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        start_tls: bool = True,
+        max_size: int = 5,
+        timeout: float = 30
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_size))
+        self._idle: List[aiosmtplib.SMTP] = []
+        self.connections_opened = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password)
+        self.connections_opened += 1
+        return client
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrow a connection; it goes back to the pool unless the caller raised"""
+        async with self._semaphore:
+            client = None
+            while self._idle and client is None:
+                candidate = self._idle.pop()
+                if candidate.is_connected:
+                    client = candidate
+            if client is None:
+                client = await self._connect()
+
+            try:
+                yield client
+            except BaseException:
+                # The connection may be in an unknown state; drop it
+                await self._discard(client)
+                raise
+            self._idle.append(client)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for client in idle:
+            await self._discard(client)
+
+    @staticmethod
+    async def _discard(client: aiosmtplib.SMTP):
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+
 class EmailService:
     """Service for sending emails via Gmail SMTP"""
     
@@ -15,10 +92,21 @@ class EmailService:
         settings = get_settings()
         self.gmail_address = settings.gmail_address
         self.gmail_app_password = settings.gmail_app_password
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = settings.smtp_host
+        self.smtp_port = settings.smtp_port
+        self.max_retries = max(1, settings.smtp_max_retries)
+        self.retry_base_delay = settings.smtp_retry_base_delay
+        self.pool = SMTPConnectionPool(
+            hostname=self.smtp_server,
+            port=self.smtp_port,
+            username=self.gmail_address,
+            password=self.gmail_app_password,
+            start_tls=settings.smtp_start_tls,
+            max_size=settings.smtp_pool_size,
+            timeout=settings.smtp_timeout
+        )
     
-    def send_analysis_results(
+    async def send_analysis_results(
         self, 
         to_email: str, 
         company_name: str,
@@ -43,19 +131,25 @@ class EmailService:
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        # Send via Gmail SMTP
-        try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.gmail_address, self.gmail_app_password)
-                server.send_message(msg)
-            print(f"✅ Email sent to {to_email}")
-            return True
-        except Exception as e:
-            print(f"❌ Error sending email: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+        # Send over a pooled connection, retrying transient failures with backoff
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.pool.connection() as server:
+                    await server.send_message(msg)
+                print(f"✅ Email sent to {to_email}")
+                return True
+            except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError) as e:
+                permanent = isinstance(e, aiosmtplib.SMTPResponseException) and 500 <= e.code < 600
+                if permanent or attempt == self.max_retries:
+                    print(f"❌ Error sending email: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return False
+
+                delay = self.retry_base_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                print(f"⚠️  Email send attempt {attempt} failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        return False
     
     def _format_html_email(
         self, 
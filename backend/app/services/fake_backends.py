@@ -0,0 +1,179 @@
+"""
+Offline stand-ins for Gemini and DuckDuckGo
+
+Selected with LLM_BACKEND=fake / SEARCH_BACKEND=fake so the app, the
+benchmarks and local demos run without network access or quota. Latency,
+error rate and canned responses are configurable; errors surface as the same
+exception types the real backends raise, so retry paths are exercised too.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from google.genai import errors
+
+
+# Canned response per prompt kind; "claims" is used when a deck chunk has no numeric lines
+DEFAULT_RESPONSES = {
+    "claims": [
+        "The global analytics market is worth $50B",
+        "$2M ARR, up 3x year over year",
+        "CEO was previously VP Engineering at Stripe",
+    ],
+    "verification": (
+        "1. Verification Status: Partially Verified\n"
+        "2. Evidence: Stand-in evidence\n"
+        "3. Confidence Level: Medium\n"
+        "4. Red Flags: None\n"
+        "5. Next Steps: Request source data"
+    ),
+    "questions": [f"Stand-in question {i}?" for i in range(1, 11)],
+    "search": "Stand-in search results for: {query}",
+}
+
+_DECK_TEXT = re.compile(r"Pitch Deck[^\n]*:\n(.*?)\n\s*(?:Also identify the company name|Return a JSON)", re.S)
+_BATCH_SIZE = re.compile(r"Verify each of the (\d+) claims")
+
+# Streamed responses arrive in this many pieces
+STREAM_PIECES = 8
+
+
+def _category(claim: str) -> str:
+    lowered = claim.lower()
+    if "market" in lowered:
+        return "market"
+    if any(word in lowered for word in ("ceo", "cto", "founder", "previously")):
+        return "team"
+    if any(word in lowered for word in ("faster", "accuracy", "engine")):
+        return "technology"
+    return "revenue"
+
+
+class FakeGeminiModels:
+    """Stand-in for client.aio.models; answers by prompt kind after a simulated latency"""
+
+    def __init__(
+        self,
+        latency: float,
+        error_rate: float = 0.0,
+        responses: Optional[Dict] = None,
+        seed: Optional[int] = None,
+        max_claims_per_chunk: int = 6
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.responses = {**DEFAULT_RESPONSES, **(responses or {})}
+        self.max_claims_per_chunk = max_claims_per_chunk
+        self._random = random.Random(seed)
+
+    def _claims_for(self, contents: str) -> List[str]:
+        """Claims are the deck's numeric lines, so longer decks yield more claims"""
+        match = _DECK_TEXT.search(contents)
+        lines = [line.strip() for line in (match.group(1) if match else "").split("\n")]
+        claims = [line for line in lines if line and any(ch.isdigit() for ch in line)
+                  and not line.lower().startswith("slide ")]
+        return claims[:self.max_claims_per_chunk] or list(self.responses["claims"])
+
+    def respond(self, contents: str) -> str:
+        if "extract ALL verifiable claims" in contents:
+            return json.dumps({
+                "company_name": "Acme Analytics",
+                "claims": [
+                    {"claim": claim, "category": _category(claim), "importance": "high",
+                     "needs_verification": True}
+                    for claim in self._claims_for(contents)
+                ]
+            })
+        if "extract all the key claims" in contents:
+            return json.dumps([
+                {"claim": claim, "category": _category(claim), "importance": "high"}
+                for claim in self._claims_for(contents)
+            ])
+        if "claim_index" in contents:
+            count = int(_BATCH_SIZE.search(contents).group(1))
+            return json.dumps([
+                {"claim_index": i, "verification_status": "Partially Verified",
+                 "evidence": "Stand-in evidence", "confidence_level": "Medium",
+                 "red_flags": "None", "next_steps": "Request source data"}
+                for i in range(count)
+            ])
+        if "numbered list" in contents.lower():
+            return "\n".join(f"{i}. {q}" for i, q in enumerate(self.responses["questions"], 1))
+        return self.responses["verification"]
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise errors.ServerError(503, {"error": {
+                "code": 503, "message": "Stand-in backend unavailable", "status": "UNAVAILABLE"
+            }})
+        text = self.respond(contents)
+        return SimpleNamespace(text=text, usage_metadata=self._usage(contents, text))
+
+    async def generate_content_stream(self, model, contents, config=None):
+        """Same response as generate_content, delivered in pieces spread over the latency"""
+        if self.error_rate and self._random.random() < self.error_rate:
+            await asyncio.sleep(self.latency / STREAM_PIECES)
+            raise errors.ServerError(503, {"error": {
+                "code": 503, "message": "Stand-in backend unavailable", "status": "UNAVAILABLE"
+            }})
+        text = self.respond(contents)
+        size = max(1, -(-len(text) // STREAM_PIECES))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+        async def stream():
+            for i, piece in enumerate(pieces):
+                await asyncio.sleep(self.latency / len(pieces))
+                last = i == len(pieces) - 1
+                yield SimpleNamespace(text=piece, usage_metadata=self._usage(contents, text) if last else None)
+
+        return stream()
+
+    @staticmethod
+    def _usage(contents: str, text: str) -> SimpleNamespace:
+        # Rough token usage so tokens-per-minute limits settle as they would against Gemini
+        return SimpleNamespace(
+            prompt_token_count=len(contents) // 4,
+            candidates_token_count=len(text) // 4,
+            total_token_count=(len(contents) + len(text)) // 4
+        )
+
+
+class FakeGeminiClient:
+    """Drop-in for genai.Client: only the aio.models surface LLMClient uses"""
+
+    def __init__(self, **kwargs):
+        self.aio = SimpleNamespace(models=FakeGeminiModels(**kwargs))
+
+
+class FakeSearch:
+    """Stand-in for DuckDuckGoSearchAPIWrapper; blocks like the real one"""
+
+    def __init__(self, latency: float, error_rate: float = 0.0, response: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.response = response or DEFAULT_RESPONSES["search"]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def run(self, query: str) -> str:
+        time.sleep(self.latency)
+        if self.error_rate:
+            with self._lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                raise TimeoutError("Stand-in search timed out")
+        return self.response.format(query=query)
+
+
+def load_canned_responses(path: str) -> Dict:
+    """Canned responses from a JSON file with any of the DEFAULT_RESPONSES keys"""
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -1,16 +1,35 @@
-from google import genai
-from google.genai import types
-from typing import Dict, List
+from typing import Dict, List, Optional
+from app.services.claim_chunking import IMPORTANCE_RANK, DeckChunk, chunk_pages, merge_claims
+from app.services.llm_client import LLMClient
 from app.config import get_settings
+import asyncio
 
 
 class GeminiService:
     def __init__(self):
+        self.llm = LLMClient()
+
+    async def extract_claims(self, pitch_deck_text: str, pages: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Extract key claims from the whole pitch deck.
+        Long decks are split into page-aligned chunks that are extracted in
+        parallel and merged, so latency stays close to a single call.
+        """
         settings = get_settings()
-        self.client = genai.Client(api_key=settings.google_api_key)
+        chunks = chunk_pages(pages or [pitch_deck_text], settings.claim_chunk_chars)
+        if not chunks:
+            return await self._extract_chunk_claims(pitch_deck_text)
+
+        semaphore = asyncio.Semaphore(max(1, settings.claim_extraction_concurrency))
+
+        async def extract_with_limit(chunk: DeckChunk) -> List[Dict]:
+            async with semaphore:
+                return await self._extract_chunk_claims(chunk.text)
 
-    async def extract_claims(self, pitch_deck_text: str) -> List[Dict]:
-        """Extract key claims from pitch deck"""
+        chunk_claims = await asyncio.gather(*[extract_with_limit(chunk) for chunk in chunks])
+        return merge_claims(chunk_claims, chunks)
+
+    async def _extract_chunk_claims(self, pitch_deck_text: str) -> List[Dict]:
         prompt = f"""
         Analyze this pitch deck and extract all the key claims, facts, and statements that should be verified.
         Focus on:
@@ -34,11 +53,8 @@ class GeminiService:
         ]
         """
 
-        response = self.client.models.generate_content(
-            model='gemini-2.5-flash-lite',
-            contents=prompt
-        )
-        return self._parse_claims_response(response.text)
+        response_text = await self.llm.generate(prompt)
+        return self._parse_claims_response(response_text)
 
     async def verify_claim(self, claim: str) -> Dict:
         """Verify a specific claim using Gemini's knowledge"""
@@ -56,17 +72,34 @@ class GeminiService:
         Be thorough but concise.
         """
 
-        response = self.client.models.generate_content(
-            model='gemini-2.5-flash-lite',
-            contents=prompt
-        )
+        response_text = await self.llm.generate(prompt)
         return {
             "claim": claim,
-            "verification_result": response.text
+            "verification_result": response_text
         }
 
-    async def generate_questions(self, pitch_deck_text: str, verification_results: List[Dict]) -> List[str]:
-        """Generate personalized questions based on verification results"""
+    async def generate_questions(self, claims: List[Dict], verification_results: List[Dict]) -> List[str]:
+        """
+        Generate personalized questions based on verification results.
+        The deck is represented by its extracted claims, most important first
+        and capped at QUESTION_CONTEXT_CHARS, so the prompt stays bounded.
+        """
+        claim_lines = [
+            f"- [{c.get('category', 'other')}] {c.get('claim', str(c))}"
+            for c in sorted(
+                claims,
+                key=lambda c: IMPORTANCE_RANK.get(str(c.get("importance", "")).lower(), len(IMPORTANCE_RANK))
+            )
+        ]
+        budget = get_settings().question_context_chars
+        kept, used = [], 0
+        for line in claim_lines:
+            if used + len(line) > budget:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        claim_summary = "\n".join(kept)
+
         verification_summary = "\n".join([
             f"- {v['claim']}: {v.get('verification_result', 'Not verified')}"
             for v in verification_results
@@ -75,7 +108,7 @@ class GeminiService:
         prompt = f"""
         You are helping an investor prepare for a meeting with a startup founder.
 
-        Based on the pitch deck and verification results below, generate 8-12 insightful questions
+        Based on the pitch deck's claims and verification results below, generate 8-12 insightful questions
         the investor should ask the founder. Focus on:
         - Unverified or questionable claims
         - Gaps in the pitch
@@ -84,8 +117,8 @@ class GeminiService:
         - Business model sustainability
         - Team capabilities
 
-        Pitch Deck Summary:
-        {pitch_deck_text[:2000]}...
+        Claims in the Pitch Deck:
+        {claim_summary}
 
         Verification Results:
         {verification_summary}
@@ -94,11 +127,8 @@ class GeminiService:
         Return as a numbered list.
         """
 
-        response = self.client.models.generate_content(
-            model='gemini-2.5-flash-lite',
-            contents=prompt
-        )
-        return self._parse_questions_response(response.text)
+        response_text = await self.llm.generate(prompt)
+        return self._parse_questions_response(response_text)
 
     def _parse_claims_response(self, response_text: str) -> List[Dict]:
         """Parse the claims from Gemini's response"""
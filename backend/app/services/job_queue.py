@@ -0,0 +1,244 @@
+"""
+Background job queue for long-running analyses
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a fixed pool of asyncio workers.
+    Job state lives in SQLite so queued and interrupted jobs survive a restart.
+    Several processes can share the database: idle workers poll it for jobs
+    submitted elsewhere, and running jobs hold a lease renewed by heartbeat,
+    so only jobs whose worker died are taken over.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        workers: int,
+        retention_seconds: int = 7 * 24 * 3600,
+        lease_seconds: float = 120,
+        poll_seconds: float = 2.0
+    ):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.workers = max(1, workers)
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+        self._conn.commit()
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine that runs jobs of this kind"""
+        self.handlers[kind] = handler
+
+    async def start(self):
+        """Start the worker pool and re-enqueue jobs left over from a previous run"""
+        self._queue = asyncio.Queue()
+        pending = await asyncio.to_thread(self._recover)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            print(f"♻️  Resuming {len(pending)} unfinished jobs")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a new job and hand it to the worker pool"""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        if self._queue is None:
+            raise RuntimeError("Job queue has not been started")
+
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(self._insert, job_id, kind, payload)
+        self._queue.put_nowait(job_id)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._fetch, job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self):
+        while True:
+            try:
+                job_id = await asyncio.wait_for(self._queue.get(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                # Nothing submitted here; look for jobs submitted to (or abandoned by) other processes
+                job_id = await asyncio.to_thread(self._next_queued)
+                if job_id is not None:
+                    await self._run(job_id)
+                continue
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await asyncio.to_thread(self._claim, job_id)
+        if job is None:
+            return
+
+        handler = self.handlers.get(job["kind"])
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job['kind']}'")
+            result = await handler(job["payload"])
+        except asyncio.CancelledError:
+            # Shutting down: leave the job running so the next start picks it up
+            raise
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {type(e).__name__}: {str(e)}")
+            traceback.print_exc()
+            await asyncio.to_thread(self._finish, job_id, JobStatus.FAILED, None, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await asyncio.to_thread(self._finish, job_id, JobStatus.SUCCEEDED, result, None)
+
+    async def _heartbeat(self, job_id: str):
+        """Renew the job's lease while it runs"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self._touch, job_id)
+
+    # SQLite helpers, run in worker threads
+
+    def _requeue_expired(self):
+        """Put running jobs whose lease ran out (their worker died) back in the queue; caller holds the lock"""
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+            "WHERE status = ? AND COALESCE(heartbeat_at, started_at, 0) < ?",
+            (JobStatus.QUEUED, JobStatus.RUNNING, time.time() - self.lease_seconds)
+        )
+
+    def _recover(self) -> List[str]:
+        """Requeue jobs interrupted mid-run and drop finished jobs past retention"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            self._requeue_expired()
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (JobStatus.SUCCEEDED, JobStatus.FAILED, cutoff)
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (JobStatus.QUEUED,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _next_queued(self) -> Optional[str]:
+        """Oldest queued job in the database, after reclaiming expired leases"""
+        with self._lock:
+            self._requeue_expired()
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JobStatus.QUEUED,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _touch(self, job_id: str):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+            self._conn.commit()
+
+    def _insert(self, job_id: str, kind: str, payload: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, JobStatus.QUEUED, json.dumps(payload), time.time())
+            )
+            self._conn.commit()
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically move a queued job to running; None if someone else has it"""
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+                (JobStatus.RUNNING, now, now, job_id, JobStatus.QUEUED)
+            )
+            self._conn.commit()
+            if cursor.rowcount != 1:
+                return None
+        return self._fetch(job_id)
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]], error: Optional[str]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def _fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, payload, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "payload": json.loads(row[3]),
+            "result": json.loads(row[4]) if row[4] is not None else None,
+            "error": row[5],
+            "created_at": row[6],
+            "started_at": row[7],
+            "finished_at": row[8]
+        }
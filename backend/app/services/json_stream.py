@@ -0,0 +1,90 @@
+"""
+Incremental parsing of streamed claim-extraction responses
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+
+class ClaimStreamParser:
+    """
+    Parses {"company_name": ..., "claims": [{...}, ...]} as it streams in.
+    feed() returns each claim object as soon as its closing brace arrives;
+    company_name is set once its value is complete. The full response text is
+    kept so callers can still parse the finished document as a whole.
+    """
+
+    def __init__(self):
+        self.company_name: Optional[str] = None
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._key: Optional[str] = None
+        self._expect_value = False
+        self._in_claims = False
+        self._claim_start: Optional[int] = None
+
+    def feed(self, piece: str) -> List[Dict[str, Any]]:
+        self.text += piece
+        text = self.text
+        claims = []
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._string_done(text[self._string_start:i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in '{[':
+                self._depth += 1
+                if ch == '[' and self._depth == 2 and self._expect_value and self._key == 'claims':
+                    self._in_claims = True
+                elif ch == '{' and self._in_claims and self._depth == 3:
+                    self._claim_start = i
+            elif ch in '}]':
+                if ch == '}' and self._in_claims and self._depth == 3 and self._claim_start is not None:
+                    claim = self._load(text[self._claim_start:i + 1])
+                    if isinstance(claim, dict) and claim.get('claim'):
+                        claims.append(claim)
+                    self._claim_start = None
+                elif ch == ']' and self._in_claims and self._depth == 2:
+                    self._in_claims = False
+                self._depth = max(0, self._depth - 1)
+            elif self._depth == 1:
+                # Top-level object: track which key the next value belongs to
+                if ch == ':':
+                    self._key = self._last_key
+                    self._expect_value = True
+                elif ch == ',':
+                    self._expect_value = False
+
+        self._pos = len(text)
+        return claims
+
+    def _string_done(self, raw: str):
+        if self._depth != 1:
+            return
+        value = self._load(raw)
+        if not self._expect_value:
+            self._last_key = value
+        elif self._key == 'company_name' and isinstance(value, str):
+            self.company_name = value
+
+    @staticmethod
+    def _load(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
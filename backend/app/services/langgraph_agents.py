@@ -1,20 +1,129 @@
 """
 LangGraph Multi-Agent Workflow for Pitch Deck Verification
 """
-from typing import TypedDict, Annotated, List, Dict, Any
+from typing import TypedDict, Annotated, List, Dict, Any, AsyncIterator, Optional
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
-from google import genai
-from app.services.agent_tools import VerificationTools
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+from app.services.agent_tools import VerificationTools, finish_request_searches, start_request_searches
+from app.services.batch import current_batch
+from app.services.claim_chunking import IMPORTANCE_RANK, DeckChunk, chunk_pages, merge_claims, normalize_claim
+from app.services.claim_store import VerifiedClaimStore, get_claim_store
+from app.services.deck_revision import RevisionPlan
+from app.services.json_stream import ClaimStreamParser
+from app.services.llm_client import LLMClient, PROMPT_VERSION
+from app.services.metrics import AnalysisUsage, finish_analysis, start_analysis, track_node
 from app.config import get_settings
+import asyncio
 import json
 import re
 
 
+class ClaimVerdict(BaseModel):
+    """Structured verdict for one claim in a batched verification call"""
+    claim_index: int
+    verification_status: str
+    evidence: str
+    confidence_level: str
+    red_flags: str
+    next_steps: str
+
+    def to_text(self) -> str:
+        """Render in the same numbered layout as a per-claim verification"""
+        return (
+            f"1. Verification Status: {self.verification_status}\n"
+            f"2. Evidence: {self.evidence}\n"
+            f"3. Confidence Level: {self.confidence_level}\n"
+            f"4. Red Flags: {self.red_flags}\n"
+            f"5. Next Steps: {self.next_steps}"
+        )
+
+
+class ExtractedClaim(BaseModel):
+    claim: str
+    category: str
+    importance: str
+    needs_verification: bool
+
+
+class ClaimExtraction(BaseModel):
+    """Response schema for claim extraction; company_name comes first so it streams before the claims"""
+    company_name: str
+    claims: List[ExtractedClaim]
+
+
+# Search tools for these categories look up the company itself, so their
+# research depends on the company name as well as the claim
+COMPANY_CATEGORIES = {"team", "revenue", "traction"}
+
+
+def claim_store_scope(category: Optional[str], company_name: Optional[str]) -> Optional[str]:
+    """
+    Scope a verification is stored and reused under: company-dependent claims
+    only for the same company, None (not shared) when that company is unknown
+    """
+    if category not in COMPANY_CATEGORIES:
+        return ""
+    if company_name in (None, '', 'Unknown'):
+        return None
+    return VerifiedClaimStore.company_scope(company_name)
+
+
+class ResearchPrefetch:
+    """
+    Research started on high-importance claims while extraction is still
+    streaming. research_claims_node takes over the tasks for the claims it
+    selects and cancels the rest.
+    """
+
+    def __init__(self, research, budget: int, concurrency: int):
+        self._research = research
+        self.budget = budget
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.tasks: Dict[tuple, asyncio.Task] = {}
+
+    @staticmethod
+    def key(claim_obj: Dict[str, Any], company_name: Optional[str]) -> tuple:
+        category = claim_obj.get('category', 'other')
+        return (
+            normalize_claim(claim_obj.get('claim', '')),
+            category,
+            company_name if category in COMPANY_CATEGORIES else ""
+        )
+
+    def offer(self, claim_obj: Dict[str, Any], company_name: Optional[str]):
+        """Start research on a freshly extracted claim if it is sure to be worth it"""
+        if len(self.tasks) >= self.budget:
+            return
+        if claim_obj.get('importance') != 'high' or not claim_obj.get('needs_verification', True):
+            return
+        if claim_obj.get('category') in COMPANY_CATEGORIES and company_name in (None, '', 'Unknown'):
+            return
+        key = self.key(claim_obj, company_name)
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(self._research(claim_obj, company_name, self.semaphore))
+
+    def started(self, claim_obj: Dict[str, Any], company_name: str) -> bool:
+        return self.key(claim_obj, company_name) in self.tasks
+
+    def take(self, claim_obj: Dict[str, Any], company_name: str) -> Optional[asyncio.Task]:
+        return self.tasks.pop(self.key(claim_obj, company_name), None)
+
+    def cancel(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+
 # Define the state that flows through the graph
 class AgentState(TypedDict):
     pitch_deck_text: str
+    pages: List[str]
     company_name: str
     claims: List[Dict[str, Any]]
+    research_prefetch: Optional[ResearchPrefetch]
+    revision: Optional[RevisionPlan]
     research_results: List[Dict[str, Any]]
     verification_results: List[Dict[str, Any]]
     questions: List[str]
@@ -25,10 +134,10 @@ class PitchDeckVerificationGraph:
     """LangGraph workflow for multi-agent pitch deck verification"""
 
     def __init__(self):
-        settings = get_settings()
-        self.client = genai.Client(api_key=settings.google_api_key)
-        self.model_name = "gemini-2.5-flash-lite"
+        self.llm = LLMClient()
+        self.model_name = self.llm.model_name
         self.tools = VerificationTools()
+        self.claim_store = get_claim_store()
         self.workflow = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
@@ -36,10 +145,10 @@ class PitchDeckVerificationGraph:
         workflow = StateGraph(AgentState)
 
         # Add nodes for each agent
-        workflow.add_node("extract_claims", self.extract_claims_node)
-        workflow.add_node("research_claims", self.research_claims_node)
-        workflow.add_node("verify_claims", self.verify_claims_node)
-        workflow.add_node("generate_questions", self.generate_questions_node)
+        workflow.add_node("extract_claims", self._timed("extract_claims", self.extract_claims_node))
+        workflow.add_node("research_claims", self._timed("research_claims", self.research_claims_node))
+        workflow.add_node("verify_claims", self._timed("verify_claims", self.verify_claims_node))
+        workflow.add_node("generate_questions", self._timed("generate_questions", self.generate_questions_node))
 
         # Define the flow
         workflow.set_entry_point("extract_claims")
@@ -50,13 +159,97 @@ class PitchDeckVerificationGraph:
 
         return workflow.compile()
 
-    def extract_claims_node(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def _timed(name: str, node):
+        """Wrap a node so its duration and errors are recorded in app.services.metrics"""
+        async def run(state: AgentState) -> AgentState:
+            with track_node(name):
+                return await node(state)
+        return run
+
+    async def extract_claims_node(self, state: AgentState) -> AgentState:
         """
         Agent 1: Claim Extractor
-        Extracts verifiable claims from the pitch deck
+        Extracts verifiable claims from the whole pitch deck: the deck is split
+        into page-aligned chunks, each chunk is extracted in parallel, and the
+        results are merged and deduplicated. With PIPELINE_RESEARCH on, chunks
+        are streamed and research starts on each high-importance claim as soon
+        as it is parsed. For a revision of an analyzed deck, only pages that
+        changed (and the rest of their chunks) are extracted and the previous
+        version's claims from unchanged pages are carried over.
         """
         print("🔍 Agent 1: Extracting claims...")
 
+        settings = get_settings()
+        revision = state.get('revision')
+        pages = state.get('pages') or [state['pitch_deck_text']]
+        if revision is not None:
+            pages = revision.pages_to_extract(pages)
+        chunks = chunk_pages(pages, settings.claim_chunk_chars)
+        semaphore = asyncio.Semaphore(max(1, settings.claim_extraction_concurrency))
+        prefetch = None
+        # A revision extracts a few pages, and their claims are mostly verified already
+        if settings.pipeline_research and revision is None:
+            prefetch = ResearchPrefetch(
+                self._research_or_reuse, settings.research_claim_budget, settings.research_concurrency
+            )
+
+        async def extract_with_limit(chunk: DeckChunk):
+            async with semaphore:
+                return await self._extract_chunk(chunk, len(chunks), prefetch)
+
+        try:
+            outcomes = await asyncio.gather(*[extract_with_limit(chunk) for chunk in chunks])
+            if chunks and all(outcome is None for outcome in outcomes):
+                # Fail the run rather than return (and cache) an analysis with no claims
+                raise RuntimeError("Claim extraction failed for every part of the deck")
+        except BaseException:
+            if prefetch is not None:
+                prefetch.cancel()
+            raise
+        failed = sum(1 for outcome in outcomes if outcome is None)
+        if failed:
+            print(f"⚠️  Claim extraction failed for {failed} of {len(chunks)} chunks")
+
+        parsed = [outcome for outcome in outcomes if outcome is not None]
+        claims = merge_claims(
+            [outcome[1] or [] for outcome in parsed],
+            [chunk for chunk, outcome in zip(chunks, outcomes) if outcome is not None]
+        )
+        company_name = next((name for name, _ in parsed if name and name != 'Unknown'), 'Unknown')
+        if revision is not None:
+            # Carried claims go first so unchanged claims keep their earlier wording
+            claims = sorted(
+                merge_claims([revision.carried_claims, claims]),
+                key=lambda c: c.get('source_pages', [0])[0]
+            )
+            if revision.company_name != 'Unknown':
+                company_name = revision.company_name
+        if not claims and any(outcome[1] is None for outcome in parsed):
+            # Fallback if JSON parsing fails
+            claims = [{
+                "claim": "Unable to extract structured claims",
+                "category": "general",
+                "importance": "low",
+                "needs_verification": False
+            }]
+
+        # The cover slide usually names the company, so the earliest chunk wins
+        state['company_name'] = company_name
+        state['claims'] = claims
+        state['research_prefetch'] = prefetch
+        state['current_step'] = 'claims_extracted'
+        print(f"✅ Extracted {len(state['claims'])} claims from {len(chunks)} chunk(s)")
+        return state
+
+    async def _extract_chunk(self, chunk: DeckChunk, chunk_count: int, prefetch: Optional[ResearchPrefetch] = None):
+        """
+        Extract claims from one chunk.
+        Returns (company_name, claims), with claims None if the response had no JSON,
+        or None if the Gemini call failed. With a prefetch, the response is
+        streamed and each claim is handed to it as soon as it is complete.
+        """
+        section = "Pitch Deck:" if chunk_count == 1 else f"Pitch Deck ({chunk.label}; other pages are analyzed separately):"
         prompt = f"""
         You are a senior investment analyst. Analyze this pitch deck and extract ALL verifiable claims.
 
@@ -68,8 +261,8 @@ class PitchDeckVerificationGraph:
         5. Competitive advantages and differentiators
         6. Customer/traction metrics
 
-        Pitch Deck:
-        {state['pitch_deck_text'][:3000]}
+        {section}
+        {chunk.text}
 
         Also identify the company name if mentioned.
 
@@ -89,144 +282,394 @@ class PitchDeckVerificationGraph:
         Return ONLY valid JSON, no other text.
         """
 
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=ClaimExtraction
+        )
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            if prefetch is None:
+                response_text = await self.llm.generate(prompt, config=config)
+            else:
+                response_text = await self._stream_chunk(prompt, config, chunk, prefetch)
         except Exception as e:
-            print(f"❌ Error calling Gemini API in extract_claims_node: {type(e).__name__}: {str(e)}")
+            print(f"❌ Error calling Gemini API in extract_claims_node ({chunk.label}): {type(e).__name__}: {str(e)}")
             import traceback
             traceback.print_exc()
-            state['claims'] = []
-            state['company_name'] = 'Unknown'
-            state['current_step'] = 'claims_extraction_failed'
-            return state
+            return None
 
+        company_name, claims = 'Unknown', None
         try:
             # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', response.text)
+            json_match = re.search(r'\{[\s\S]*\}', response_text)
             if json_match:
                 result = json.loads(json_match.group())
-                state['claims'] = result.get('claims', [])
-                state['company_name'] = result.get('company_name', 'Unknown')
-            else:
-                # Fallback if JSON parsing fails
-                state['claims'] = [{
-                    "claim": "Unable to extract structured claims",
-                    "category": "general",
-                    "importance": "low",
-                    "needs_verification": False
-                }]
-                state['company_name'] = 'Unknown'
+                claims = result.get('claims', [])
+                company_name = result.get('company_name', 'Unknown')
         except Exception as e:
-            print(f"❌ Error in extract_claims_node: {type(e).__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            state['claims'] = []
-            state['company_name'] = 'Unknown'
-
-        state['current_step'] = 'claims_extracted'
-        print(f"✅ Extracted {len(state['claims'])} claims")
-        return state
-
-    def research_claims_node(self, state: AgentState) -> AgentState:
+            print(f"❌ Error in extract_claims_node ({chunk.label}): {type(e).__name__}: {str(e)}")
+            claims = []
+
+        # Progress event for streaming clients; a no-op outside astream
+        get_stream_writer()({
+            "event": "chunk_extracted",
+            "pages": [chunk.first_page, chunk.last_page],
+            "claims": len(claims or [])
+        })
+        return company_name, claims
+
+    async def _stream_chunk(
+        self,
+        prompt: str,
+        config: types.GenerateContentConfig,
+        chunk: DeckChunk,
+        prefetch: ResearchPrefetch
+    ) -> str:
+        """Stream one chunk's extraction, handing each complete claim to the prefetch; returns the full text"""
+        parser = ClaimStreamParser()
+        stream_writer = get_stream_writer()
+        async for piece in self.llm.generate_stream(prompt, config=config):
+            for claim_obj in parser.feed(piece):
+                # Progress event for streaming clients; claims are not yet merged across chunks
+                stream_writer({
+                    "event": "claim_extracted",
+                    "pages": [chunk.first_page, chunk.last_page],
+                    "claim": claim_obj
+                })
+                prefetch.offer(claim_obj, parser.company_name)
+        return parser.text
+
+    async def research_claims_node(self, state: AgentState) -> AgentState:
         """
         Agent 2: Research Agent
-        Uses tools to gather data for verifying claims
+        Uses tools to gather data for verifying claims.
+        Claims already verified for an earlier deck are taken from the
+        verified-claim store instead of being researched again, and research
+        started during extraction is picked up rather than repeated. For a
+        revision, claims verified for the previous version keep their verdicts.
         """
         print("🔎 Agent 2: Researching claims...")
 
-        research_results = []
-
-        # Research top 3 high-importance claims to avoid rate limits
-        high_priority_claims = [
-            c for c in state['claims']
-            if c.get('importance') == 'high' and c.get('needs_verification', True)
-        ][:3]
-
-        for claim_obj in high_priority_claims:
-            claim = claim_obj['claim']
-            category = claim_obj['category']
-
-            print(f"  Researching: {claim[:60]}...")
-
-            # Use appropriate tool based on claim category
-            research_data = ""
-
-            if category == "market":
-                research_data = self.tools.search_market_data(claim)
-            elif category == "team":
-                # Extract person name from claim
-                research_data = self.tools.search_person(claim, state['company_name'])
-            elif category == "technology":
-                research_data = self.tools.search_technology(claim)
-            elif category == "competitive":
-                research_data = self.tools.analyze_competitor(claim, "")
-            elif category in ["revenue", "traction"]:
-                research_data = self.tools.search_company_info(state['company_name'])
-            else:
-                research_data = self.tools.web_search(claim)
-
-            research_results.append({
-                "claim": claim,
-                "category": category,
-                "research_data": research_data[:1000]  # Limit to avoid token overload
-            })
+        settings = get_settings()
+        company_name = state['company_name']
+        prefetch = state.get('research_prefetch')
+
+        # Research every claim that needs verification, most important first,
+        # up to the per-request claim budget; among equally important claims,
+        # those already being researched go first
+        eligible_claims = sorted(
+            [c for c in state['claims'] if c.get('needs_verification', True)],
+            key=lambda c: (
+                IMPORTANCE_RANK.get(str(c.get('importance', '')).lower(), len(IMPORTANCE_RANK)),
+                prefetch is None or not prefetch.started(c, company_name)
+            )
+        )[:settings.research_claim_budget]
+
+        # Fan the searches out at once; the semaphore bounds how many run in parallel
+        if prefetch is not None:
+            semaphore = prefetch.semaphore
+        else:
+            semaphore = asyncio.Semaphore(max(1, settings.research_concurrency))
+
+        revision = state.get('revision')
+        pending = []
+        prefetched = 0
+        for claim_obj in eligible_claims:
+            previous = revision.previous_verification(claim_obj) if revision is not None else None
+            if previous is not None:
+                pending.append(self._carry_over(claim_obj, previous))
+                continue
+            task = prefetch.take(claim_obj, company_name) if prefetch is not None else None
+            prefetched += task is not None
+            pending.append(task if task is not None else self._research_or_reuse(claim_obj, company_name, semaphore))
 
+        try:
+            research_results = await asyncio.gather(*pending)
+        finally:
+            if prefetch is not None:
+                # Research started on claims that were merged away or fell outside the budget
+                prefetch.cancel()
+
+        # Prefetched research carries the wording from its chunk; keep the merged claim text
+        research_results = [
+            {**result, "claim": claim_obj['claim']} for result, claim_obj in zip(research_results, eligible_claims)
+        ]
+        reused_count = sum(1 for result in research_results if 'reused_verification' in result)
         state['research_results'] = research_results
+        state['research_prefetch'] = None
         state['current_step'] = 'research_complete'
-        print(f"✅ Researched {len(research_results)} claims")
+        print(f"✅ Researched {len(research_results) - reused_count} claims "
+              f"({prefetched} started during extraction), reused {reused_count}")
         return state
 
-    def verify_claims_node(self, state: AgentState) -> AgentState:
+    @staticmethod
+    async def _carry_over(claim_obj: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "claim": claim_obj['claim'],
+            "category": claim_obj.get('category', 'other'),
+            "reused_verification": previous
+        }
+
+    async def _research_or_reuse(
+        self,
+        claim_obj: Dict[str, Any],
+        company_name: str,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Take a fresh verification from the claim store, or research the claim.
+        Within a batch analysis, decks making the same claim share one run.
+        """
+        batch = current_batch()
+        if batch is not None:
+            return await batch.research(
+                ResearchPrefetch.key(claim_obj, company_name),
+                lambda: self._lookup_or_research(claim_obj, company_name, semaphore)
+            )
+        return await self._lookup_or_research(claim_obj, company_name, semaphore)
+
+    async def _lookup_or_research(
+        self,
+        claim_obj: Dict[str, Any],
+        company_name: str,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        scope = claim_store_scope(claim_obj.get('category', 'other'), company_name)
+        if self.claim_store is not None and scope is not None:
+            stored = await asyncio.to_thread(
+                self.claim_store.lookup, claim_obj['claim'], self.model_name, PROMPT_VERSION, scope
+            )
+            if stored is not None:
+                print(f"  Reusing verification ({stored['match']} match): {claim_obj['claim'][:60]}...")
+                return {
+                    "claim": claim_obj['claim'],
+                    "category": claim_obj.get('category', 'other'),
+                    "reused_verification": stored
+                }
+        async with semaphore:
+            return await self._research_claim(claim_obj, company_name)
+
+    async def _research_claim(self, claim_obj: Dict[str, Any], company_name: str) -> Dict[str, Any]:
+        """Run the search tool that matches the claim's category"""
+        claim = claim_obj['claim']
+        category = claim_obj.get('category', 'other')
+
+        print(f"  Researching: {claim[:60]}...")
+
+        # Search tools are blocking, so each one runs in a worker thread
+        if category == "market":
+            research_data = await asyncio.to_thread(self.tools.search_market_data, claim)
+        elif category == "team":
+            # Extract person name from claim
+            research_data = await asyncio.to_thread(self.tools.search_person, claim, company_name)
+        elif category == "technology":
+            research_data = await asyncio.to_thread(self.tools.search_technology, claim)
+        elif category == "competitive":
+            research_data = await asyncio.to_thread(self.tools.analyze_competitor, claim, "")
+        elif category in ["revenue", "traction"]:
+            research_data = await asyncio.to_thread(self.tools.search_company_info, company_name)
+        else:
+            research_data = await asyncio.to_thread(self.tools.web_search, claim)
+
+        # Progress event for streaming clients; a no-op outside astream
+        get_stream_writer()({"event": "claim_researched", "claim": claim, "category": category})
+
+        return {
+            "claim": claim,
+            "category": category,
+            "research_data": research_data[:1000],  # Limit to avoid token overload
+            # Tools report failures as text; such verdicts are not worth storing
+            "search_failed": "search failed:" in research_data[:100].lower()
+        }
+
+    async def verify_claims_node(self, state: AgentState) -> AgentState:
         """
         Agent 3: Verification Agent
-        Analyzes claims against research data
+        Analyzes claims against research data; reused verifications pass
+        straight through and new ones are added to the verified-claim store
         """
         print("✓ Agent 3: Verifying claims...")
 
-        verification_results = []
+        settings = get_settings()
+        research_results = [r for r in state['research_results'] if 'reused_verification' not in r]
+        batch_size = settings.verification_batch_size
+        semaphore = asyncio.Semaphore(max(1, settings.verification_concurrency))
+        stream_writer = get_stream_writer()
+
+        if batch_size <= 1:
+            async def verify_with_limit(research: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    result = await self._verify_single(research)
+                stream_writer({"event": "claim_verified", "verification": result})
+                return result
+
+            verification_results = list(await asyncio.gather(
+                *[verify_with_limit(research) for research in research_results]
+            ))
+        else:
+            # Several claims per request, several requests in flight
+            batches = [
+                research_results[i:i + batch_size]
+                for i in range(0, len(research_results), batch_size)
+            ]
+
+            async def verify_batch_with_limit(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                results = await self._verify_batch(batch, semaphore)
+                for result in results:
+                    stream_writer({"event": "claim_verified", "verification": result})
+                return results
 
+            batch_results = await asyncio.gather(
+                *[verify_batch_with_limit(batch) for batch in batches]
+            )
+            verification_results = [result for batch in batch_results for result in batch]
+
+        if self.claim_store is not None:
+            await asyncio.gather(*[
+                asyncio.to_thread(
+                    self.claim_store.put,
+                    result['claim'], research.get('category'), result['verification_result'],
+                    result['research_summary'], state['company_name'], self.model_name, PROMPT_VERSION,
+                    claim_store_scope(research.get('category'), state['company_name'])
+                )
+                for research, result in zip(research_results, verification_results)
+                if not research.get('search_failed')
+                and claim_store_scope(research.get('category'), state['company_name']) is not None
+            ])
+
+        # Keep research order, with reused verifications in their original place
+        fresh = iter(verification_results)
+        combined = []
         for research in state['research_results']:
-            claim = research['claim']
-            research_data = research['research_data']
+            stored = research.get('reused_verification')
+            if stored is None:
+                combined.append(next(fresh))
+                continue
+            result = {
+                "claim": research['claim'],
+                "verification_result": stored['verification_result'],
+                "research_summary": stored['research_summary'],
+                "reused": {
+                    "matched_claim": stored['claim'],
+                    "match": stored['match'],
+                    "similarity": stored['similarity'],
+                    "source": stored['source'],
+                    "verified_at": stored['verified_at'],
+                    "age_seconds": stored['age_seconds']
+                }
+            }
+            stream_writer({"event": "claim_verified", "verification": result})
+            combined.append(result)
+
+        state['verification_results'] = combined
+        state['current_step'] = 'verification_complete'
+        print(f"✅ Verified {len(verification_results)} claims, reused {len(combined) - len(verification_results)}")
+        return state
 
-            prompt = f"""
-            You are a fact-checker for investor due diligence.
+    async def _verify_single(self, research: Dict[str, Any]) -> Dict[str, Any]:
+        """Verify one claim with its own Gemini call"""
+        claim = research['claim']
+        research_data = research['research_data']
 
-            Claim to verify: "{claim}"
+        prompt = f"""
+        You are a fact-checker for investor due diligence.
 
-            Research data found:
-            {research_data}
+        Claim to verify: "{claim}"
 
-            Provide:
-            1. Verification Status: [Verified / Partially Verified / Cannot Verify / Red Flag]
-            2. Evidence: What supports or contradicts this claim?
-            3. Confidence Level: [High / Medium / Low]
-            4. Red Flags: Any concerns or inconsistencies?
-            5. Next Steps: How should the investor verify this further?
+        Research data found:
+        {research_data}
 
-            Be thorough but concise. Focus on facts.
-            """
+        Provide:
+        1. Verification Status: [Verified / Partially Verified / Cannot Verify / Red Flag]
+        2. Evidence: What supports or contradicts this claim?
+        3. Confidence Level: [High / Medium / Low]
+        4. Red Flags: Any concerns or inconsistencies?
+        5. Next Steps: How should the investor verify this further?
 
-            response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt
-        )
+        Be thorough but concise. Focus on facts.
+        """
 
-            verification_results.append({
-                "claim": claim,
-                "verification_result": response.text,
-                "research_summary": research_data[:300]
-            })
+        response_text = await self.llm.generate(prompt)
 
-        state['verification_results'] = verification_results
-        state['current_step'] = 'verification_complete'
-        print(f"✅ Verified {len(verification_results)} claims")
-        return state
+        return {
+            "claim": claim,
+            "verification_result": response_text,
+            "research_summary": research_data[:300]
+        }
+
+    async def _verify_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """
+        Verify several claims in one structured-output call.
+        Claims whose verdict is missing or malformed fall back to a per-claim call.
+        Every Gemini call, batched or fallback, takes its own semaphore slot.
+        """
+        claims_block = "\n\n".join([
+            f"Claim {i}: \"{research['claim']}\"\nResearch data found:\n{research['research_data']}"
+            for i, research in enumerate(batch)
+        ])
+
+        prompt = f"""
+        You are a fact-checker for investor due diligence.
 
-    def generate_questions_node(self, state: AgentState) -> AgentState:
+        Verify each of the {len(batch)} claims below against its research data.
+
+        {claims_block}
+
+        For every claim return one object with:
+        - claim_index: the number of the claim above
+        - verification_status: Verified / Partially Verified / Cannot Verify / Red Flag
+        - evidence: What supports or contradicts this claim?
+        - confidence_level: High / Medium / Low
+        - red_flags: Any concerns or inconsistencies?
+        - next_steps: How should the investor verify this further?
+
+        Be thorough but concise. Focus on facts.
+        """
+
+        verdicts: Dict[int, ClaimVerdict] = {}
+        try:
+            async with semaphore:
+                response_text = await self.llm.generate(prompt, config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=list[ClaimVerdict]
+                ))
+            for item in json.loads(response_text):
+                try:
+                    verdict = ClaimVerdict.model_validate(item)
+                except ValidationError:
+                    continue
+                if 0 <= verdict.claim_index < len(batch):
+                    verdicts[verdict.claim_index] = verdict
+        except Exception as e:
+            print(f"❌ Batched verification failed, falling back to per-claim calls: {type(e).__name__}: {str(e)}")
+
+        missing = [i for i in range(len(batch)) if i not in verdicts]
+        if missing:
+            print(f"  Re-verifying {len(missing)} of {len(batch)} claims individually")
+
+        async def verify_with_limit(research: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._verify_single(research)
+
+        fallback_results = await asyncio.gather(*[verify_with_limit(batch[i]) for i in missing])
+        fallback_by_index = dict(zip(missing, fallback_results))
+
+        results = []
+        for i, research in enumerate(batch):
+            if i in fallback_by_index:
+                results.append(fallback_by_index[i])
+                continue
+            results.append({
+                "claim": research['claim'],
+                "verification_result": verdicts[i].to_text(),
+                "research_summary": research['research_data'][:300]
+            })
+        return results
+
+    async def generate_questions_node(self, state: AgentState) -> AgentState:
         """
         Agent 4: Question Generator
         Generates personalized questions based on verification
@@ -263,14 +706,11 @@ class PitchDeckVerificationGraph:
         Return as a numbered list (1., 2., 3., etc.)
         """
 
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt
-        )
+        response_text = await self.llm.generate(prompt)
 
         # Parse questions
         questions = []
-        for line in response.text.split('\n'):
+        for line in response_text.split('\n'):
             match = re.match(r'^\d+[\.\)]\s*(.+)$', line.strip())
             if match:
                 questions.append(match.group(1))
@@ -280,30 +720,28 @@ class PitchDeckVerificationGraph:
         print(f"✅ Generated {len(questions)} questions")
         return state
 
-    async def analyze_pitch_deck(self, pitch_deck_text: str) -> Dict[str, Any]:
-        """
-        Run the full multi-agent workflow
-        """
-        print("\n🚀 Starting LangGraph Multi-Agent Verification Workflow\n")
-
-        # Initialize state
-        initial_state = AgentState(
+    @staticmethod
+    def _initial_state(
+        pitch_deck_text: str,
+        pages: Optional[List[str]] = None,
+        revision: Optional[RevisionPlan] = None
+    ) -> AgentState:
+        return AgentState(
             pitch_deck_text=pitch_deck_text,
+            pages=pages or [pitch_deck_text],
             company_name="Unknown",
             claims=[],
+            research_prefetch=None,
+            revision=revision,
             research_results=[],
             verification_results=[],
             questions=[],
             current_step="initialized"
         )
 
-        # Run the workflow
-        final_state = self.workflow.invoke(initial_state)
-
-        print("\n✅ Workflow Complete!\n")
-
-        # Format response
-        return {
+    @staticmethod
+    def _format_result(final_state: AgentState, usage: Optional[AnalysisUsage] = None) -> Dict[str, Any]:
+        result = {
             "company_name": final_state['company_name'],
             "claims": final_state['claims'],
             "verification_results": final_state['verification_results'],
@@ -311,6 +749,91 @@ class PitchDeckVerificationGraph:
             "summary": {
                 "total_claims": len(final_state['claims']),
                 "verified_claims": len(final_state['verification_results']),
+                "reused_verifications": sum(1 for v in final_state['verification_results'] if 'reused' in v),
                 "questions_generated": len(final_state['questions'])
             }
         }
+        if usage is not None:
+            # Per-node seconds plus Gemini/search call counts, tokens and estimated cost
+            result["summary"].update(usage.to_summary())
+        revision = final_state.get('revision')
+        if revision is not None:
+            result["revision"] = revision.report(final_state['claims'], len(final_state['pages']))
+        return result
+
+    async def analyze_pitch_deck(
+        self,
+        pitch_deck_text: str,
+        pages: Optional[List[str]] = None,
+        revision: Optional[RevisionPlan] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the full multi-agent workflow.
+        Pass the deck's pages to keep extraction chunks aligned to slides, and a
+        revision plan to re-analyze only what changed since an earlier version.
+        """
+        print("\n🚀 Starting LangGraph Multi-Agent Verification Workflow\n")
+
+        # Run the workflow without blocking the event loop
+        usage, token = start_analysis()
+        searches_token = start_request_searches()
+        try:
+            final_state = await self.workflow.ainvoke(self._initial_state(pitch_deck_text, pages, revision))
+        finally:
+            finish_request_searches(searches_token)
+            finish_analysis(token)
+
+        print("\n✅ Workflow Complete!\n")
+
+        # Format response
+        return self._format_result(final_state, usage)
+
+    async def stream_analysis(
+        self,
+        pitch_deck_text: str,
+        pages: Optional[List[str]] = None,
+        revision: Optional[RevisionPlan] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the workflow and yield progress events as each step completes:
+        chunk_extracted (per deck chunk), claims_extracted, claim_researched (per claim), research_complete,
+        claim_verified (per claim), verification_complete, questions_generated,
+        and finally complete with the same payload as analyze_pitch_deck.
+        """
+        print("\n🚀 Starting LangGraph Multi-Agent Verification Workflow (streaming)\n")
+
+        final_state = self._initial_state(pitch_deck_text, pages, revision)
+        usage, token = start_analysis()
+        searches_token = start_request_searches()
+        try:
+            async for mode, chunk in self.workflow.astream(final_state, stream_mode=["updates", "custom"]):
+                if mode == "custom":
+                    yield chunk
+                    continue
+
+                for node_name, update in chunk.items():
+                    final_state = update
+                    yield self._node_event(node_name, update)
+        finally:
+            finish_request_searches(searches_token)
+            finish_analysis(token)
+
+        print("\n✅ Workflow Complete!\n")
+        yield {"event": "complete", "result": self._format_result(final_state, usage)}
+
+    @staticmethod
+    def _node_event(node_name: str, state: AgentState) -> Dict[str, Any]:
+        """Compact event for a finished node, without re-sending the deck text"""
+        step = state['current_step']
+        if node_name == "extract_claims":
+            return {"event": "claims_extracted", "step": step,
+                    "company_name": state['company_name'], "claims": state['claims']}
+        if node_name == "research_claims":
+            return {"event": "research_complete", "step": step,
+                    "researched_claims": len(state['research_results'])}
+        if node_name == "verify_claims":
+            return {"event": "verification_complete", "step": step,
+                    "verification_results": state['verification_results']}
+        if node_name == "generate_questions":
+            return {"event": "questions_generated", "step": step, "questions": state['questions']}
+        return {"event": node_name, "step": step}
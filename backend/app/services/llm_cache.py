@@ -0,0 +1,76 @@
+"""
+Prompt-level cache of Gemini responses, shared by every LLMClient
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from app.config import get_settings
+from app.services.cache_store import DiskCache, MemoryLRU, TieredCache
+
+
+class LLMResponseCache:
+    """
+    Caches response text keyed on (model, prompt, generation config).
+    Prompts are deterministic functions of their inputs, so an identical
+    prompt can reuse an earlier answer instead of spending quota.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.ttl = settings.llm_cache_ttl_seconds
+        self.cache = TieredCache(
+            MemoryLRU(settings.llm_cache_memory_entries),
+            DiskCache(
+                os.path.join(settings.cache_dir, "llm_responses.sqlite3"),
+                max_bytes=settings.llm_cache_max_mb * 1024 * 1024
+            )
+        )
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, config: Optional[Any], prompt_version: str) -> str:
+        # Schema types in the config are not JSON-serializable, so fall back to repr
+        config_json = json.dumps(
+            config.model_dump(exclude_none=True) if config is not None else {},
+            sort_keys=True,
+            default=repr
+        )
+        digest = hashlib.sha256(
+            "\0".join([model_name, prompt_version, config_json, prompt]).encode("utf-8")
+        ).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        value, tier = self.cache.get(key)
+        with self._lock:
+            if tier == TieredCache.MEMORY:
+                self._counts["memory_hits"] += 1
+            elif tier == TieredCache.DISK:
+                self._counts["disk_hits"] += 1
+            else:
+                self._counts["misses"] += 1
+        return value
+
+    def set(self, key: str, response_text: str):
+        self.cache.set(key, response_text, self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit ratio since process start"""
+        with self._lock:
+            counts = dict(self._counts)
+        hits = counts["memory_hits"] + counts["disk_hits"]
+        lookups = hits + counts["misses"]
+        counts["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return counts
+
+
+@lru_cache()
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide response cache, or None when LLM_CACHE_ENABLED is off"""
+    if not get_settings().llm_cache_enabled:
+        return None
+    return LLMResponseCache()
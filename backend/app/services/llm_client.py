@@ -0,0 +1,155 @@
+"""
+Async Gemini client shared by GeminiService and the LangGraph agents
+"""
+from google import genai
+from google.genai import types
+from typing import AsyncIterator, Optional
+from app.config import get_settings
+from app.services.fake_backends import FakeGeminiClient, load_canned_responses
+from app.services.llm_cache import get_llm_cache
+from app.services.metrics import record_llm_call
+from app.services.rate_limiter import backoff_delay, get_llm_limiter, is_retryable
+import asyncio
+import time
+
+
+DEFAULT_MODEL = "gemini-2.5-flash-lite"
+
+# Bump whenever a prompt or response format changes so cached results are not reused
+PROMPT_VERSION = "2"
+
+# Output tokens reserved against the tokens-per-minute budget before a call;
+# corrected from the response's usage metadata afterwards
+OUTPUT_TOKEN_ALLOWANCE = 1024
+
+
+class LLMClient:
+    """Thin async wrapper around the google-genai client"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        settings = get_settings()
+        if settings.llm_backend == "fake":
+            self.client = FakeGeminiClient(
+                latency=settings.fake_llm_latency,
+                error_rate=settings.fake_error_rate,
+                responses=load_canned_responses(settings.fake_responses_file),
+                seed=settings.fake_seed
+            )
+        else:
+            self.client = genai.Client(api_key=settings.google_api_key)
+        self.model_name = model_name
+        self.cache = get_llm_cache()
+        self.limiter = get_llm_limiter()
+        self.max_retries = max(1, settings.llm_max_retries)
+        self.retry_base_delay = settings.llm_retry_base_delay
+
+    async def generate(
+        self,
+        prompt: str,
+        config: Optional[types.GenerateContentConfig] = None
+    ) -> str:
+        """
+        Generate a completion without blocking the event loop.
+        Uses the client's aio surface so many requests can be in flight at once.
+        Identical (model, prompt, config) requests are served from the response
+        cache when LLM_CACHE_ENABLED is on. Calls wait on the shared rate limiter
+        and are retried with backoff on 429/5xx. Latency, tokens and outcome are
+        recorded in app.services.metrics.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_name, prompt, config, PROMPT_VERSION)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                record_llm_call(self.model_name, "cache_hit")
+                return cached
+
+        # Rough estimate (4 characters per token) until the real usage is known
+        reserved_tokens = len(prompt) // 4 + OUTPUT_TOKEN_ALLOWANCE
+        start = time.perf_counter()
+        for attempt in range(1, self.max_retries + 1):
+            await self.limiter.acquire(reserved_tokens)
+            try:
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config
+                )
+                break
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    record_llm_call(self.model_name, "error", time.perf_counter() - start, retries=attempt - 1)
+                    raise
+                delay = backoff_delay(attempt, self.retry_base_delay)
+                print(f"⚠️  Gemini call attempt {attempt} failed ({type(e).__name__}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        self._record_success(getattr(response, "usage_metadata", None), reserved_tokens, start, attempt)
+        response_text = response.text or ""
+
+        if cache_key is not None and response_text:
+            await asyncio.to_thread(self.cache.set, cache_key, response_text)
+        return response_text
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        config: Optional[types.GenerateContentConfig] = None
+    ) -> AsyncIterator[str]:
+        """
+        Like generate(), but yields the response text piece by piece as Gemini
+        streams it. A failed call is only retried if nothing has been yielded
+        yet; a cached response is yielded in one piece.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_name, prompt, config, PROMPT_VERSION)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                record_llm_call(self.model_name, "cache_hit")
+                yield cached
+                return
+
+        reserved_tokens = len(prompt) // 4 + OUTPUT_TOKEN_ALLOWANCE
+        start = time.perf_counter()
+        pieces = []
+        usage = None
+        for attempt in range(1, self.max_retries + 1):
+            await self.limiter.acquire(reserved_tokens)
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config
+                )
+                async for chunk in stream:
+                    # Usage metadata is cumulative; the last chunk carries the totals
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    if chunk.text:
+                        pieces.append(chunk.text)
+                        yield chunk.text
+                break
+            except Exception as e:
+                if pieces or not is_retryable(e) or attempt == self.max_retries:
+                    record_llm_call(self.model_name, "error", time.perf_counter() - start, retries=attempt - 1)
+                    raise
+                delay = backoff_delay(attempt, self.retry_base_delay)
+                print(f"⚠️  Gemini stream attempt {attempt} failed ({type(e).__name__}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        self._record_success(usage, reserved_tokens, start, attempt)
+        response_text = "".join(pieces)
+        if cache_key is not None and response_text:
+            await asyncio.to_thread(self.cache.set, cache_key, response_text)
+
+    def _record_success(self, usage, reserved_tokens: int, start: float, attempt: int):
+        """Settle the token reservation and record the call's metrics"""
+        self.limiter.settle_tokens(reserved_tokens, getattr(usage, "total_token_count", None) or 0)
+        record_llm_call(
+            self.model_name,
+            "ok",
+            time.perf_counter() - start,
+            input_tokens=getattr(usage, "prompt_token_count", None) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", None) or 0,
+            retries=attempt - 1
+        )
@@ -0,0 +1,239 @@
+"""
+Workflow, Gemini and tool instrumentation
+
+Process-wide counters and histograms are exposed in Prometheus text format
+on /metrics. While an analysis runs, the same measurements are also collected
+into an AnalysisUsage (found through a context variable) so the result's
+summary can show where that analysis spent its time and tokens.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.config import get_settings
+
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _labels(self.labelnames, key, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+NODE_SECONDS = Histogram(
+    "pitchdeck_node_duration_seconds", "Time spent in each workflow node", ("node",))
+NODE_ERRORS = Counter(
+    "pitchdeck_node_errors_total", "Workflow node runs that raised", ("node",))
+LLM_SECONDS = Histogram(
+    "pitchdeck_llm_request_duration_seconds", "Gemini call latency, including retries", ("model",))
+LLM_REQUESTS = Counter(
+    "pitchdeck_llm_requests_total", "Gemini calls by outcome (ok, error, cache_hit)", ("model", "status"))
+LLM_RETRIES = Counter(
+    "pitchdeck_llm_retries_total", "Gemini calls retried after a 429/5xx", ("model",))
+LLM_TOKENS = Counter(
+    "pitchdeck_llm_tokens_total", "Gemini tokens by direction (input, output)", ("model", "direction"))
+LLM_COST = Counter(
+    "pitchdeck_llm_cost_usd_total", "Estimated Gemini spend from token counts", ("model",))
+TOOL_SECONDS = Histogram(
+    "pitchdeck_tool_duration_seconds", "Search tool latency, including retries", ("tool",))
+TOOL_CALLS = Counter(
+    "pitchdeck_tool_calls_total", "Search tool calls by outcome (ok, error, cache_hit, coalesced)", ("tool", "status"))
+ANALYSES_JOINED = Counter(
+    "pitchdeck_analyses_joined_total", "Analysis requests that attached to an identical run in flight", ("method",))
+
+METRICS = [
+    NODE_SECONDS, NODE_ERRORS, LLM_SECONDS, LLM_REQUESTS, LLM_RETRIES,
+    LLM_TOKENS, LLM_COST, TOOL_SECONDS, TOOL_CALLS, ANALYSES_JOINED,
+]
+
+
+class AnalysisUsage:
+    """Timings, tokens and call counts for one analysis"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.node_seconds: Dict[str, float] = {}
+        self.llm = {"calls": 0, "cache_hits": 0, "errors": 0, "retries": 0,
+                    "input_tokens": 0, "output_tokens": 0, "seconds": 0.0, "estimated_cost_usd": 0.0}
+        self.tools = {"calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def to_summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            timings = {node: round(seconds, 3) for node, seconds in self.node_seconds.items()}
+            timings["total"] = round(time.perf_counter() - self.started, 3)
+            llm = {**self.llm, "seconds": round(self.llm["seconds"], 3),
+                   "estimated_cost_usd": round(self.llm["estimated_cost_usd"], 6)}
+            tools = {**self.tools, "seconds": round(self.tools["seconds"], 3),
+                     # Calls answered without a search of their own
+                     "saved_calls": self.tools["cache_hits"] + self.tools["coalesced"]}
+        return {"timings": timings, "usage": {"llm": llm, "tools": tools}}
+
+
+_current_usage: ContextVar[Optional[AnalysisUsage]] = ContextVar("analysis_usage", default=None)
+
+
+def start_analysis() -> Tuple[AnalysisUsage, Token]:
+    """Begin collecting usage for the analysis running in this context"""
+    usage = AnalysisUsage()
+    return usage, _current_usage.set(usage)
+
+
+def finish_analysis(token: Token):
+    try:
+        _current_usage.reset(token)
+    except ValueError:
+        # Async generators can be closed from a different context; nothing to undo there
+        pass
+
+
+@contextmanager
+def track_node(node: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        NODE_ERRORS.inc(node=node)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        NODE_SECONDS.observe(elapsed, node=node)
+        usage = _current_usage.get()
+        if usage is not None:
+            with usage._lock:
+                usage.node_seconds[node] = usage.node_seconds.get(node, 0.0) + elapsed
+
+
+def record_llm_call(
+    model: str,
+    status: str,
+    seconds: float = 0.0,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    retries: int = 0
+):
+    """Record one Gemini call; status is ok, error or cache_hit"""
+    settings = get_settings()
+    cost = (input_tokens * settings.llm_input_cost_per_million
+            + output_tokens * settings.llm_output_cost_per_million) / 1_000_000
+
+    LLM_REQUESTS.inc(model=model, status=status)
+    if status != "cache_hit":
+        LLM_SECONDS.observe(seconds, model=model)
+    if retries:
+        LLM_RETRIES.inc(retries, model=model)
+    if input_tokens:
+        LLM_TOKENS.inc(input_tokens, model=model, direction="input")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, model=model, direction="output")
+    if cost:
+        LLM_COST.inc(cost, model=model)
+
+    usage = _current_usage.get()
+    if usage is not None:
+        with usage._lock:
+            usage.llm["calls"] += 1
+            usage.llm["cache_hits"] += status == "cache_hit"
+            usage.llm["errors"] += status == "error"
+            usage.llm["retries"] += retries
+            usage.llm["input_tokens"] += input_tokens
+            usage.llm["output_tokens"] += output_tokens
+            usage.llm["seconds"] += seconds
+            usage.llm["estimated_cost_usd"] += cost
+
+
+def record_tool_call(tool: str, status: str, seconds: float = 0.0):
+    """
+    Record one search tool call; status is ok, error, cache_hit, or coalesced
+    when the call shared another caller's identical search
+    """
+    TOOL_CALLS.inc(tool=tool, status=status)
+    if status not in ("cache_hit", "coalesced"):
+        TOOL_SECONDS.observe(seconds, tool=tool)
+
+    usage = _current_usage.get()
+    if usage is not None:
+        with usage._lock:
+            usage.tools["calls"] += 1
+            usage.tools["cache_hits"] += status == "cache_hit"
+            usage.tools["coalesced"] += status == "coalesced"
+            usage.tools["errors"] += status == "error"
+            usage.tools["seconds"] += seconds
+
+
+def render_prometheus(extra_lines: Optional[List[str]] = None) -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra_lines or [])
+    return "\n".join(lines) + "\n"
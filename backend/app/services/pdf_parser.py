@@ -1,17 +1,115 @@
 import PyPDF2
-from typing import Dict, List
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from app.config import get_settings
+
+
+@dataclass
+class PDFDocument:
+    """Extracted pitch deck text, indexed by page"""
+    pages: List[str]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.pages)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(page.split()) for page in self.pages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"pages": self.pages, "metadata": self.metadata}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PDFDocument":
+        return cls(pages=data["pages"], metadata=data.get("metadata", {}))
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Worker entry point: extract pages [start, end) in a separate process"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Create the shared extraction pool on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the extraction pool's worker processes; the next large deck starts a new pool"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 class PDFParser:
     @staticmethod
-    def extract_text(pdf_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    def iter_pages(pdf_path: str) -> Iterator[str]:
+        """Yield the text of each page in order, one page at a time"""
         with open(pdf_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+                yield page.extract_text() or ""
+
+    @staticmethod
+    def extract_document(pdf_path: str) -> PDFDocument:
+        """
+        Extract a page-indexed document.
+        Large decks are split into page ranges and extracted in a process pool.
+        """
+        settings = get_settings()
+        workers = settings.pdf_parse_workers or os.cpu_count() or 1
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            page_count = len(pdf_reader.pages)
+            if page_count < settings.pdf_parallel_min_pages or workers <= 1:
+                # Small decks are extracted from the reader already open
+                return PDFDocument(pages=[page.extract_text() or "" for page in pdf_reader.pages])
+
+        # Enough ranges to keep every worker busy without tiny tasks
+        range_size = max(1, -(-page_count // (workers * 2)))
+        starts = range(0, page_count, range_size)
+        pool = _get_process_pool(workers)
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, min(start + range_size, page_count))
+            for start in starts
+        ]
+
+        pages: List[str] = []
+        for future in futures:
+            pages.extend(future.result())
+        return PDFDocument(pages=pages)
+
+    @staticmethod
+    async def extract_document_async(pdf_path: str) -> PDFDocument:
+        """Extract a document without blocking the event loop"""
+        return await asyncio.to_thread(PDFParser.extract_document, pdf_path)
+
+    @staticmethod
+    def extract_text(pdf_path: str) -> str:
+        """Extract text from PDF file"""
+        return PDFParser.extract_document(pdf_path).text
 
     @staticmethod
     def extract_structured_info(text: str) -> Dict:
@@ -0,0 +1,120 @@
+"""
+Process-wide rate limiting and retry for Gemini and web search
+
+Every Gemini call and every search in the process draws from the same token
+buckets, so concurrent analyses queue up at the quota ceiling instead of
+tripping 429s. With several worker processes, each gets an equal share.
+Calls that still fail with a rate-limit or server error are retried with
+jittered exponential backoff.
+"""
+import asyncio
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+from app.config import get_settings
+
+
+class TokenBucket:
+    """
+    Refills `rate_per_minute` units per minute up to `capacity`.
+    reserve() debits immediately (the balance may go negative) and returns how
+    long the caller must wait before its reservation is covered, so waiters are
+    served in order without polling. Thread-safe.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float):
+        """Return over-reserved units (or debit more with a negative amount)"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and optional tokens-per-minute limits; 0 disables a limit"""
+
+    # Burst allowances: a full minute's worth up front would let a sliding
+    # one-minute quota see nearly twice its limit, so calls are paced instead
+    REQUEST_BURST_SECONDS = 1
+    TOKEN_BURST_SECONDS = 10
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0):
+        self.requests = self.tokens = None
+        if requests_per_minute > 0:
+            self.requests = TokenBucket(
+                requests_per_minute, max(1.0, requests_per_minute * self.REQUEST_BURST_SECONDS / 60)
+            )
+        if tokens_per_minute > 0:
+            self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute * self.TOKEN_BURST_SECONDS / 60)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request (and `tokens` tokens); returns seconds to wait first"""
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    async def acquire(self, tokens: int = 0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, tokens: int = 0):
+        """For calls made from worker threads"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def settle_tokens(self, reserved: int, used: int):
+        """Correct the token bucket once the real usage of a call is known"""
+        if self.tokens is not None and used:
+            self.tokens.refund(reserved - used)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, server errors and timeouts are worth retrying; anything else is not"""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    name = type(error).__name__.lower()
+    if "ratelimit" in name or "timeout" in name:
+        return True
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 60.0) -> float:
+    """Jittered exponential backoff for the given 1-based attempt"""
+    return min(max_delay, base_delay * (2 ** (attempt - 1))) * random.uniform(0.5, 1.5)
+
+
+@lru_cache()
+def get_llm_limiter() -> RateLimiter:
+    """Shared by every LLMClient in the process; each worker process gets an equal share"""
+    settings = get_settings()
+    workers = max(1, settings.worker_processes)
+    return RateLimiter(settings.llm_requests_per_minute / workers, settings.llm_tokens_per_minute / workers)
+
+
+@lru_cache()
+def get_search_limiter() -> RateLimiter:
+    """Shared by every VerificationTools instance in the process; each worker process gets an equal share"""
+    settings = get_settings()
+    return RateLimiter(settings.search_requests_per_minute / max(1, settings.worker_processes))
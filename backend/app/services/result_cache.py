@@ -0,0 +1,43 @@
+"""
+Content-addressed cache of finished pitch deck analyses
+"""
+import asyncio
+import json
+import os
+from typing import Any, Dict, Optional
+from app.config import get_settings
+from app.services.cache_store import DiskCache
+from app.services.llm_client import PROMPT_VERSION
+
+
+class AnalysisResultCache:
+    """
+    Stores analysis results keyed on the PDF's SHA-256, the analysis method,
+    the model name and the prompt version, so a re-sent deck skips the LLM entirely.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.enabled = settings.result_cache_enabled
+        self.store = DiskCache(
+            os.path.join(settings.cache_dir, "analysis_results.sqlite3"),
+            max_bytes=settings.result_cache_max_mb * 1024 * 1024,
+            default_ttl=settings.result_cache_ttl_seconds
+        )
+
+    @staticmethod
+    def make_key(pdf_sha256: str, method: str, model_name: str) -> str:
+        return f"{method}:{model_name}:{PROMPT_VERSION}:{pdf_sha256}"
+
+    async def get(self, pdf_sha256: str, method: str, model_name: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = self.make_key(pdf_sha256, method, model_name)
+        value = await asyncio.to_thread(self.store.get, key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, pdf_sha256: str, method: str, model_name: str, result: Dict[str, Any]):
+        if not self.enabled:
+            return
+        key = self.make_key(pdf_sha256, method, model_name)
+        await asyncio.to_thread(self.store.set, key, json.dumps(result))
@@ -0,0 +1,217 @@
+"""
+Deck metadata and analysis results, shared by every worker process
+
+The default store is a SQLite file under DATA_DIR, which every uvicorn worker
+on the host opens, so any worker can report on a deck uploaded to or analyzed
+by another. Set RESULTS_STORE to "package.module:ClassName" to plug in another
+backend (e.g. one backed by Postgres for workers spread across hosts); the
+class is constructed with the app settings and must implement ResultsStore.
+"""
+import asyncio
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from app.config import Settings
+
+
+class AnalysisStatus:
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ResultsStore(ABC):
+    """Where decks and the analyses run on them are recorded, keyed on file_id"""
+
+    @abstractmethod
+    async def put_deck(self, file_id: str, metadata: Dict[str, Any]):
+        """Record (or update) an uploaded deck's metadata"""
+
+    @abstractmethod
+    async def get_deck(self, file_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def start_analysis(self, file_id: str, method: str):
+        """Mark an analysis as running; a finished result from an earlier run stays readable"""
+
+    @abstractmethod
+    async def finish_analysis(
+        self,
+        file_id: str,
+        method: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        """Record a finished analysis: its result, or the error it failed with"""
+
+    @abstractmethod
+    async def get_analyses(self, file_id: str) -> Dict[str, Dict[str, Any]]:
+        """Every analysis of the deck, by method"""
+
+    async def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class SQLiteResultsStore(ResultsStore):
+    """ResultsStore in one SQLite file; safe to share between threads and processes"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS decks (
+                file_id TEXT PRIMARY KEY,
+                metadata TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                file_id TEXT NOT NULL,
+                method TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                started_at REAL,
+                finished_at REAL,
+                PRIMARY KEY (file_id, method)
+            )
+        """)
+        self._conn.commit()
+
+    async def put_deck(self, file_id: str, metadata: Dict[str, Any]):
+        await asyncio.to_thread(self._put_deck, file_id, metadata)
+
+    async def get_deck(self, file_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_deck, file_id)
+
+    async def start_analysis(self, file_id: str, method: str):
+        await asyncio.to_thread(self._start_analysis, file_id, method)
+
+    async def finish_analysis(
+        self,
+        file_id: str,
+        method: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        await asyncio.to_thread(self._finish_analysis, file_id, method, result, error)
+
+    async def get_analyses(self, file_id: str) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_analyses, file_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._stats)
+
+    # SQLite helpers, run in worker threads
+
+    def _put_deck(self, file_id: str, metadata: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT metadata FROM decks WHERE file_id = ?", (file_id,)).fetchone()
+            merged = {**(json.loads(row[0]) if row else {}), **metadata}
+            self._conn.execute(
+                "INSERT INTO decks (file_id, metadata, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (file_id) DO UPDATE SET metadata = excluded.metadata, updated_at = excluded.updated_at",
+                (file_id, json.dumps(merged), now, now)
+            )
+            self._conn.commit()
+
+    def _get_deck(self, file_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata, created_at FROM decks WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[0]), "uploaded_at": row[1]}
+
+    def _start_analysis(self, file_id: str, method: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO analyses (file_id, method, status, started_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (file_id, method) DO UPDATE SET status = excluded.status, "
+                "started_at = excluded.started_at, error = NULL",
+                (file_id, method, AnalysisStatus.RUNNING, time.time())
+            )
+            self._conn.commit()
+
+    def _finish_analysis(
+        self,
+        file_id: str,
+        method: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ):
+        now = time.time()
+        with self._lock:
+            if error is None:
+                self._conn.execute(
+                    "INSERT INTO analyses (file_id, method, status, result, started_at, finished_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (file_id, method) DO UPDATE SET status = excluded.status, "
+                    "result = excluded.result, error = NULL, finished_at = excluded.finished_at",
+                    (file_id, method, AnalysisStatus.SUCCEEDED, json.dumps(result), now, now)
+                )
+            else:
+                # Keep the last good result; the status and error say the latest run failed
+                self._conn.execute(
+                    "INSERT INTO analyses (file_id, method, status, error, started_at, finished_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (file_id, method) DO UPDATE SET status = excluded.status, "
+                    "error = excluded.error, finished_at = excluded.finished_at",
+                    (file_id, method, AnalysisStatus.FAILED, error, now, now)
+                )
+            self._conn.commit()
+
+    def _get_analyses(self, file_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT method, status, result, error, started_at, finished_at FROM analyses WHERE file_id = ?",
+                (file_id,)
+            ).fetchall()
+        return {
+            method: {
+                "status": status,
+                "result": json.loads(result) if result is not None else None,
+                "error": error,
+                "started_at": started_at,
+                "finished_at": finished_at
+            }
+            for method, status, result, error, started_at, finished_at in rows
+        }
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (decks,) = self._conn.execute("SELECT COUNT(*) FROM decks").fetchone()
+            by_status = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM analyses GROUP BY status"
+            ).fetchall())
+        return {"backend": "sqlite", "decks": decks, "analyses": by_status}
+
+
+def create_results_store(settings: Settings) -> ResultsStore:
+    """The configured store: "sqlite" (default) or a "package.module:ClassName" plug-in"""
+    if settings.results_store == "sqlite":
+        return SQLiteResultsStore(os.path.join(settings.data_dir, "results.sqlite3"))
+
+    module_name, _, class_name = settings.results_store.partition(":")
+    if not class_name:
+        raise ValueError(f"RESULTS_STORE must be 'sqlite' or 'package.module:ClassName', got '{settings.results_store}'")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(store_class, type) and issubclass(store_class, ResultsStore)):
+        raise ValueError(f"{settings.results_store} is not a ResultsStore")
+    return store_class(settings)
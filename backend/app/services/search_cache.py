@@ -0,0 +1,61 @@
+"""
+Two-tier cache for VerificationTools search results
+"""
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+from app.config import get_settings
+from app.services.cache_store import DiskCache, MemoryLRU, TieredCache
+
+
+class SearchCache:
+    """
+    Caches raw search results per tool, keyed on a normalized query.
+    Each tool has its own TTL: market sizes change slowly, news does not.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.ttls = settings.search_cache_ttl_seconds
+        self.default_ttl = self.ttls.get("default", 24 * 3600)
+        self.cache = TieredCache(
+            MemoryLRU(settings.search_cache_memory_entries),
+            DiskCache(
+                os.path.join(settings.cache_dir, "search_results.sqlite3"),
+                max_bytes=settings.search_cache_max_mb * 1024 * 1024
+            )
+        )
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase and collapse whitespace so trivially different queries share a key"""
+        return re.sub(r"\s+", " ", query).strip().lower()
+
+    def make_key(self, tool: str, query: str) -> str:
+        return f"{tool}:{self.normalize_query(query)}"
+
+    def get(self, tool: str, query: str) -> Optional[str]:
+        value, tier = self.cache.get(self.make_key(tool, query))
+        with self._lock:
+            if tier == TieredCache.MEMORY:
+                self._counts[tool]["memory_hits"] += 1
+            elif tier == TieredCache.DISK:
+                self._counts[tool]["disk_hits"] += 1
+            else:
+                self._counts[tool]["misses"] += 1
+        return value
+
+    def set(self, tool: str, query: str, results: str):
+        ttl = self.ttls.get(tool, self.default_ttl)
+        self.cache.set(self.make_key(tool, query), results, ttl)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per tool since process start"""
+        with self._lock:
+            return {tool: dict(counts) for tool, counts in self._counts.items()}
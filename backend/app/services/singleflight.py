@@ -0,0 +1,98 @@
+"""
+Coalescing of identical blocking calls ("singleflight")
+
+The first caller for a key runs the call; callers that arrive while it is in
+flight wait for it and get the same result (or exception) instead of running
+it again. With keep_results, finished results are kept as well, so later
+callers for the key share them too for as long as the object lives, which is
+how one analysis or one batch reuses its searches. AsyncSingleFlight does the
+same for coroutines, such as whole analyses.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Thread-safe: calls are made from worker threads"""
+
+    def __init__(self, keep_results: bool = False):
+        self.keep_results = keep_results
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, run: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return run()'s result for key and whether it was shared with another
+        caller rather than run here. Failures are never kept, so the next
+        caller after a failed run tries again.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = self._calls[key] = Future()
+                self.runs += 1
+            else:
+                self.shared += 1
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = run()
+        except BaseException as e:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_exception(e)
+            raise
+        if not self.keep_results:
+            with self._lock:
+                self._calls.pop(key, None)
+        future.set_result(result)
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"runs": self.runs, "shared": self.shared}
+
+
+class AsyncSingleFlight:
+    """
+    Coroutine counterpart of SingleFlight, for one event loop. The first
+    caller's run becomes a task that later callers for the key attach to;
+    callers wait on it shielded, so one that goes away does not cancel the
+    run for the others. Keys are dropped as soon as the run finishes.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.runs = 0
+        self.joined = 0
+
+    def start(self, key: Hashable, run: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, bool]:
+        """The task running for key (starting it if there is none) and whether it was already running"""
+        task = self._tasks.get(key)
+        if task is not None:
+            self.joined += 1
+            return task, True
+
+        task = self._tasks[key] = asyncio.ensure_future(run())
+        self.runs += 1
+
+        def forget(done: asyncio.Task):
+            if self._tasks.get(key) is done:
+                del self._tasks[key]
+        task.add_done_callback(forget)
+        return task, False
+
+    async def do(self, key: Hashable, run: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await the run for key; returns its result and whether this caller joined an existing run"""
+        task, joined = self.start(key, run)
+        return await asyncio.shield(task), joined
+
+    def stats(self) -> Dict[str, int]:
+        return {"runs": self.runs, "joined": self.joined, "in_flight": len(self._tasks)}
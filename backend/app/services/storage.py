@@ -0,0 +1,117 @@
+"""
+Streaming storage for uploaded pitch decks and their extracted-text sidecars
+"""
+import aiofiles
+import aiofiles.os
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from fastapi import UploadFile
+from typing import BinaryIO, Optional
+from app.services.pdf_parser import PDFDocument
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+async def save_upload(
+    upload: UploadFile,
+    dest_path: str,
+    max_bytes: int,
+    chunk_size: int = 1024 * 1024
+) -> StoredUpload:
+    """
+    Stream an upload to disk in fixed-size chunks, hashing as the bytes arrive.
+    Memory use is bounded by chunk_size regardless of file size; the partial
+    file is removed if the upload is too large or the copy fails.
+    """
+    # The spooled size is known up front for multipart uploads, so reject early
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(dest_path, "wb") as out:
+            while chunk := await upload.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit"
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        if await aiofiles.os.path.exists(dest_path):
+            await aiofiles.os.remove(dest_path)
+        raise
+
+    return StoredUpload(path=dest_path, sha256=digest.hexdigest(), size=size)
+
+
+def save_stream(
+    source: BinaryIO,
+    dest_path: str,
+    max_bytes: int,
+    chunk_size: int = 1024 * 1024
+) -> StoredUpload:
+    """
+    Blocking counterpart of save_upload for file-like sources (e.g. zip members):
+    copies in chunks, hashing as it goes, and removes the partial file on failure
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, "wb") as out:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+    return StoredUpload(path=dest_path, sha256=digest.hexdigest(), size=size)
+
+
+def write_sidecar(path: str, document: PDFDocument):
+    """Persist per-page text and metadata as gzip-compressed JSON"""
+    payload = json.dumps(document.to_dict(), separators=(",", ":")).encode("utf-8")
+    # Write then rename so readers never see a half-written sidecar
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_sidecar(path: str) -> Optional[PDFDocument]:
+    """Load a sidecar, or None if it is missing or unreadable"""
+    try:
+        with gzip.open(path, "rb") as f:
+            return PDFDocument.from_dict(json.loads(f.read()))
+    except (OSError, ValueError, KeyError):
+        return None
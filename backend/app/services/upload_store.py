@@ -0,0 +1,294 @@
+"""
+Content-addressed storage for uploaded pitch decks
+
+Every upload is streamed to a temp file, hashed, and moved to
+blobs/{sha[:2]}/{sha}.pdf, so identical PDFs share one blob (and one
+extracted-text sidecar) however many file ids point at them. An index in
+UPLOAD_DIR maps file ids to blobs and tracks when each blob was last read;
+blobs unread for UPLOAD_TTL_DAYS are deleted, and the least recently used go
+first once the blobs pass UPLOAD_QUOTA_MB. Eviction runs on start, when an
+upload takes the store over its quota, and at most every EVICT_INTERVAL_SECONDS
+otherwise; blobs pinned by a running analysis are never evicted. Temp files are
+removed whether or not the upload succeeds, and ones left by a crashed process
+are swept on start.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from fastapi import UploadFile
+from typing import BinaryIO, Dict, Iterator, List, Optional
+from app.services.storage import StoredUpload, file_sha256, save_stream, save_upload
+
+# Temp files older than this belong to a process that died mid-upload
+STALE_TEMP_SECONDS = 3600
+
+# TTL eviction between uploads that stay under the quota
+EVICT_INTERVAL_SECONDS = 3600
+
+
+@dataclass
+class StoredDeck:
+    file_id: str
+    sha256: str
+    size: int
+    path: str
+    deduplicated: bool = False
+
+
+class UploadStore:
+    """Uploaded decks by file id, stored once per distinct PDF"""
+
+    def __init__(self, root: str, quota_bytes: int = 0, ttl_seconds: int = 0):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.temp_dir = os.path.join(root, "tmp")
+        self.quota_bytes = quota_bytes
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.temp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Blobs in use by running analyses, by sha256
+        self._pins: Counter = Counter()
+        # Stored bytes as of the last eviction plus blobs added since (other processes add theirs)
+        self._stored_bytes = 0
+        self._evicted_at = 0.0
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                file_id TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                filename TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files (sha256)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_accessed ON blobs (accessed_at)")
+        self._conn.commit()
+        self._sweep_temp()
+        self.evict()
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}.pdf")
+
+    def sidecar_path(self, sha256: str) -> str:
+        """Extracted-text sidecar, shared by every file id of the blob"""
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}.pages.json.gz")
+
+    @contextmanager
+    def temp_path(self, suffix: str = ".pdf") -> Iterator[str]:
+        """A path in the store's temp dir that is removed on exit, however the block ends"""
+        path = os.path.join(self.temp_dir, f"{uuid.uuid4()}{suffix}")
+        try:
+            yield path
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def save_upload(
+        self,
+        upload: UploadFile,
+        filename: Optional[str],
+        max_bytes: int,
+        chunk_size: int = 1024 * 1024
+    ) -> StoredDeck:
+        """Stream an upload into the store and give it a new file id"""
+        with self.temp_path() as tmp:
+            stored = await save_upload(upload, tmp, max_bytes, chunk_size)
+            return await asyncio.to_thread(self._commit, stored, filename)
+
+    def save_stream(
+        self,
+        source: BinaryIO,
+        filename: Optional[str],
+        max_bytes: int,
+        chunk_size: int = 1024 * 1024
+    ) -> StoredDeck:
+        """Blocking counterpart of save_upload for file-like sources (e.g. zip members)"""
+        with self.temp_path() as tmp:
+            stored = save_stream(source, tmp, max_bytes, chunk_size)
+            return self._commit(stored, filename)
+
+    def resolve(self, file_id: str) -> Optional[StoredDeck]:
+        """The deck stored under file_id, marking its blob as recently used; None if unknown or evicted"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blobs.sha256, blobs.size FROM files JOIN blobs ON blobs.sha256 = files.sha256 "
+                "WHERE files.file_id = ?", (file_id,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE blobs SET accessed_at = ? WHERE sha256 = ?", (now, row[0]))
+                self._conn.commit()
+
+        if row is None:
+            return self._adopt_legacy(file_id)
+        path = self.blob_path(row[0])
+        if not os.path.exists(path):
+            return None
+        return StoredDeck(file_id=file_id, sha256=row[0], size=row[1], path=path)
+
+    async def resolve_async(self, file_id: str) -> Optional[StoredDeck]:
+        return await asyncio.to_thread(self.resolve, file_id)
+
+    @contextmanager
+    def pinned(self, sha256: str) -> Iterator[None]:
+        """Keep a blob (and its sidecar) from being evicted while the block runs"""
+        with self._lock:
+            self._pins[sha256] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins[sha256] -= 1
+                if self._pins[sha256] <= 0:
+                    del self._pins[sha256]
+
+    def evict(self) -> Dict[str, int]:
+        """Delete blobs past the TTL, then least recently used ones until under the quota"""
+        now = time.time()
+        live_since = now - self.ttl_seconds if self.ttl_seconds > 0 else 0
+        with self._lock:
+            doomed: List[str] = [row[0] for row in self._conn.execute(
+                "SELECT sha256 FROM blobs WHERE accessed_at < ?", (live_since,)
+            ) if row[0] not in self._pins]
+            live = self._conn.execute(
+                "SELECT sha256, size FROM blobs WHERE accessed_at >= ? ORDER BY accessed_at", (live_since,)
+            ).fetchall()
+            total = sum(size for _, size in live)
+            if self.quota_bytes > 0:
+                # The most recently used blob stays, even if it alone is over the quota
+                for sha256, size in live[:-1]:
+                    if total <= self.quota_bytes:
+                        break
+                    if sha256 in self._pins:
+                        continue
+                    doomed.append(sha256)
+                    total -= size
+
+            file_count = 0
+            if doomed:
+                placeholders = ",".join("?" * len(doomed))
+                (file_count,) = self._conn.execute(
+                    f"SELECT COUNT(*) FROM files WHERE sha256 IN ({placeholders})", doomed
+                ).fetchone()
+                self._conn.execute(f"DELETE FROM files WHERE sha256 IN ({placeholders})", doomed)
+                self._conn.execute(f"DELETE FROM blobs WHERE sha256 IN ({placeholders})", doomed)
+                self._conn.commit()
+
+            # Unlink under the lock so a concurrent upload of the same bytes can't
+            # have its new blob deleted; skip any another process re-added meanwhile
+            for sha256 in doomed:
+                if self._conn.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,)).fetchone():
+                    continue
+                for path in (self.blob_path(sha256), self.sidecar_path(sha256)):
+                    if os.path.exists(path):
+                        os.remove(path)
+            self._stored_bytes = total
+            self._evicted_at = now
+
+        if doomed:
+            print(f"🧹 Evicted {len(doomed)} stored deck(s) ({file_count} file ids)")
+        return {"blobs": len(doomed), "files": file_count}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            blobs, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            (files,) = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        return {
+            "files": files,
+            "blobs": blobs,
+            "bytes": total,
+            "quota_bytes": self.quota_bytes,
+            "deduplicated_files": files - blobs
+        }
+
+    def _commit(self, stored: StoredUpload, filename: Optional[str]) -> StoredDeck:
+        """Move a hashed temp file to its blob and record a new file id for it"""
+        path = self.blob_path(stored.sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            deduplicated = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE sha256 = ?", (stored.sha256,)
+            ).fetchone() is not None
+            # Same bytes either way; replacing also restores a blob deleted behind the index's back
+            os.replace(stored.path, path)
+            self._conn.execute(
+                "INSERT INTO blobs (sha256, size, created_at, accessed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (sha256) DO UPDATE SET accessed_at = excluded.accessed_at",
+                (stored.sha256, stored.size, now, now)
+            )
+            self._conn.execute(
+                "INSERT INTO files (file_id, sha256, filename, created_at) VALUES (?, ?, ?, ?)",
+                (file_id, stored.sha256, filename, now)
+            )
+            self._conn.commit()
+            if not deduplicated:
+                self._stored_bytes += stored.size
+            due = (
+                (self.quota_bytes > 0 and self._stored_bytes > self.quota_bytes)
+                or (self.ttl_seconds > 0 and now - self._evicted_at > EVICT_INTERVAL_SECONDS)
+            )
+
+        if due:
+            self.evict()
+        return StoredDeck(
+            file_id=file_id, sha256=stored.sha256, size=stored.size, path=path, deduplicated=deduplicated
+        )
+
+    def _adopt_legacy(self, file_id: str) -> Optional[StoredDeck]:
+        """Move a deck stored as {file_id}.pdf before the blob layout into the store"""
+        try:
+            uuid.UUID(file_id)
+        except ValueError:
+            return None
+        legacy_path = os.path.join(self.root, f"{file_id}.pdf")
+        if not os.path.exists(legacy_path):
+            return None
+
+        with self._lock:
+            # Another request may have adopted it while this one waited
+            if os.path.exists(legacy_path):
+                sha256 = file_sha256(legacy_path)
+                path = self.blob_path(sha256)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                legacy_sidecar = os.path.join(self.root, f"{file_id}.pages.json.gz")
+                if os.path.exists(legacy_sidecar):
+                    os.replace(legacy_sidecar, self.sidecar_path(sha256))
+                size = os.path.getsize(legacy_path)
+                os.replace(legacy_path, path)
+                now = time.time()
+                self._conn.execute(
+                    "INSERT INTO blobs (sha256, size, created_at, accessed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (sha256) DO UPDATE SET accessed_at = excluded.accessed_at",
+                    (sha256, size, now, now)
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO files (file_id, sha256, filename, created_at) VALUES (?, ?, NULL, ?)",
+                    (file_id, sha256, now)
+                )
+                self._conn.commit()
+        return self.resolve(file_id)
+
+    def _sweep_temp(self):
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        for entry in os.scandir(self.temp_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
@@ -0,0 +1,96 @@
+"""
+Batch benchmark: one deck at a time vs the batch runner
+
+Stores a set of synthetic decks that overlap the way demo-day decks do (shared
+market figures, similar slides) and analyzes them with the Gemini and search
+stand-ins, first one after another through run_agent_analysis, then through
+run_batch with BATCH_CONCURRENCY decks in flight and shared research. Caches
+and the claim store are off so both runs do the same work.
+
+Usage (from backend/):
+    python -m benchmarks.batch_benchmark --decks 20 --concurrency 4
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+WORK_DIR = tempfile.mkdtemp(prefix="sago-batch-bench-")
+for key, value in {
+    "GOOGLE_API_KEY": "benchmark-placeholder",
+    "LLM_BACKEND": "fake",
+    "SEARCH_BACKEND": "fake",
+    "RESULT_CACHE_ENABLED": "false",
+    "SEARCH_CACHE_ENABLED": "false",
+    "LLM_CACHE_ENABLED": "false",
+    "CLAIM_STORE_ENABLED": "false",
+    "LLM_REQUESTS_PER_MINUTE": "0",
+    "LLM_TOKENS_PER_MINUTE": "0",
+    "SEARCH_REQUESTS_PER_MINUTE": "0",
+    "CACHE_DIR": os.path.join(WORK_DIR, "cache"),
+    "DATA_DIR": os.path.join(WORK_DIR, "data"),
+    "UPLOAD_DIR": os.path.join(WORK_DIR, "uploads"),
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.config import get_settings  # noqa: E402
+from app.routes import pitch_deck  # noqa: E402
+from app.routes.batch import run_batch  # noqa: E402
+from app.services.container import ServiceContainer  # noqa: E402
+from benchmarks.sample_pdf import make_deck  # noqa: E402
+
+
+def store_decks(services: ServiceContainer, count: int, lines_per_page: int) -> list:
+    """Decks of 4-9 slides; slides with the same index say the same things"""
+    decks = []
+    for i in range(count):
+        filename = f"deck{i}.pdf"
+        stored = services.upload_store.save_stream(
+            io.BytesIO(make_deck(4 + i % 6, lines_per_page)), filename, max_bytes=50 * 1024 * 1024
+        )
+        decks.append({"file_id": stored.file_id, "filename": filename})
+    return decks
+
+
+async def main(args):
+    settings = get_settings()
+    settings.fake_llm_latency = args.llm_latency
+    settings.fake_search_latency = args.search_latency
+    settings.batch_concurrency = args.concurrency
+    services = ServiceContainer()
+    decks = store_decks(services, args.decks, args.lines_per_page)
+
+    # Parse every deck once up front so neither run pays for it
+    for deck in decks:
+        await pitch_deck.load_document(services, deck["file_id"])
+
+    start = time.perf_counter()
+    for deck in decks:
+        await pitch_deck.run_agent_analysis(services, deck["file_id"], use_cache=False)
+    sequential = time.perf_counter() - start
+
+    report = None
+    async for event in run_batch(services, decks, use_cache=False):
+        if event["event"] == "batch_complete":
+            report = event["report"]
+    await services.aclose()
+
+    print(f"\n{args.decks} decks, LLM {args.llm_latency}s, search {args.search_latency}s\n")
+    print(f"  one at a time: {sequential:6.2f}s  ({args.decks / sequential * 60:7.1f} decks/min)")
+    print(f"  batch x{args.concurrency:<5}: {report['wall_seconds']:6.2f}s  "
+          f"({report['decks_per_minute']:7.1f} decks/min)  {report['succeeded']}/{report['decks']} succeeded")
+    print(f"  deck latency in batch: p50 {report['deck_seconds']['p50']:.2f}s  "
+          f"p95 {report['deck_seconds']['p95']:.2f}s")
+    print(f"  deduplication: {report['deduplication']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--decks", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--lines-per-page", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""
+Email delivery burst benchmark against a local SMTP stand-in
+
+Starts a minimal in-process SMTP server that charges a fixed delay per
+connection (standing in for TCP + STARTTLS + LOGIN), then delivers a burst of
+analysis emails through EmailService twice: once with pooled connections and
+once opening a fresh connection per message, as the old smtplib code did.
+
+Usage (from backend/):
+    python -m benchmarks.email_burst_benchmark --emails 50 --pool-size 5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from app.config import get_settings  # noqa: E402
+from app.services.email_service import EmailService  # noqa: E402
+
+
+class SMTPStandIn:
+    """Just enough SMTP to accept mail; counts connections and messages"""
+
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.connections = 0
+        self.messages = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await asyncio.sleep(self.handshake_delay)
+        writer.write(b"220 localhost stand-in ESMTP\r\n")
+        await writer.drain()
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip().upper()
+                if command.startswith(("EHLO", "HELO")):
+                    writer.write(b"250-localhost\r\n250 8BITMIME\r\n")
+                elif command == "DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    self.messages += 1
+                    writer.write(b"250 OK queued\r\n")
+                elif command == "QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+SUMMARY = {"total_claims": 12, "verified_claims": 5, "questions_generated": 10}
+
+
+async def send_burst(service: EmailService, count: int, fresh_connections: bool) -> float:
+    async def send(i: int):
+        ok = await service.send_analysis_results(
+            to_email=f"investor{i}@example.com",
+            company_name=f"Startup {i}",
+            verification_results=[{"claim": "TAM is $50B", "verification_result": "Verified"}],
+            questions=["What is your CAC payback?"],
+            summary=SUMMARY
+        )
+        if fresh_connections:
+            await service.pool.close()
+        return ok
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[send(i) for i in range(count)])
+    elapsed = time.perf_counter() - start
+    assert all(results), "some emails failed to send"
+    return elapsed
+
+
+async def main(args):
+    settings = get_settings()
+    settings.smtp_host = "127.0.0.1"
+    settings.smtp_start_tls = False
+    settings.gmail_address = ""
+    settings.smtp_pool_size = args.pool_size
+
+    for label, fresh in [("pooled", False), ("connection per email", True)]:
+        stand_in = SMTPStandIn(args.handshake_delay)
+        server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+        settings.smtp_port = server.sockets[0].getsockname()[1]
+
+        service = EmailService()
+        elapsed = await send_burst(service, args.emails, fresh)
+        await service.pool.close()
+        server.close()
+        await server.wait_closed()
+
+        print(f"{label:>22}: {args.emails} emails in {elapsed:.2f}s "
+              f"over {stand_in.connections} SMTP connections")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--emails", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--handshake-delay", type=float, default=0.2,
+                        help="Seconds the stand-in charges per new connection")
+    asyncio.run(main(parser.parse_args()))
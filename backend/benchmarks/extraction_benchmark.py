@@ -0,0 +1,122 @@
+"""
+Claim extraction benchmark: truncated vs single-call vs chunked map-reduce
+
+Runs the claim extraction agent over a synthetic long deck with a Gemini
+stand-in whose latency grows with the amount of deck text it is given (the
+claims it has to write out). Compares the old behaviour (first 3000
+characters only), one call over the whole deck, and page-aligned chunks
+extracted in parallel, reporting latency and how much of the deck the
+extracted claims cover.
+
+Usage (from backend/):
+    python -m benchmarks.extraction_benchmark --pages 24 --lines-per-page 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("CLAIM_STORE_ENABLED", "false")
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+os.environ.setdefault("SEARCH_REQUESTS_PER_MINUTE", "0")
+# Compares extraction strategies only; the stand-in below answers in one piece
+os.environ.setdefault("PIPELINE_RESEARCH", "false")
+
+from app.config import get_settings  # noqa: E402
+from app.services.claim_chunking import normalize_claim  # noqa: E402
+from app.services.langgraph_agents import AgentState, PitchDeckVerificationGraph  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+from benchmarks.sample_pdf import make_deck_pages  # noqa: E402
+
+CHUNK_TEXT = re.compile(r"Pitch Deck[^\n]*:\n(.*?)\n\s*Also identify the company name", re.S)
+
+
+class ChunkAwareModels:
+    """Stand-in that returns one claim per deck line it sees, slower for longer input"""
+
+    def __init__(self, base_latency: float, latency_per_1k_chars: float):
+        self.base_latency = base_latency
+        self.latency_per_1k_chars = latency_per_1k_chars
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        text = CHUNK_TEXT.search(contents).group(1)
+        await asyncio.sleep(self.base_latency + self.latency_per_1k_chars * len(text) / 1000)
+        claims = [
+            {"claim": line.strip(), "category": "market", "importance": "medium", "needs_verification": True}
+            for line in text.split("\n") if line.strip() and not line.strip().startswith("Slide ")
+        ]
+        return SimpleNamespace(text=json.dumps({"company_name": "Acme Analytics", "claims": claims}))
+
+
+def extraction_only(graph: PitchDeckVerificationGraph):
+    """The extraction agent on its own, run as a graph so it has a stream writer"""
+    workflow = StateGraph(AgentState)
+    workflow.add_node("extract_claims", graph.extract_claims_node)
+    workflow.set_entry_point("extract_claims")
+    workflow.add_edge("extract_claims", END)
+    return workflow.compile()
+
+
+async def run(graph, extractor, models, pages, chunk_chars: int) -> dict:
+    get_settings().claim_chunk_chars = chunk_chars
+    models.calls = 0
+    start = time.perf_counter()
+    state = await extractor.ainvoke(graph._initial_state("\n".join(pages), pages))
+    return {"seconds": time.perf_counter() - start, "calls": models.calls, "claims": state["claims"]}
+
+
+def coverage(claims, pages) -> float:
+    """Share of distinct deck lines that ended up as a claim"""
+    deck_lines = {
+        normalize_claim(line) for page in pages for line in page.split("\n")
+        if line.strip() and not line.startswith("Slide ")
+    }
+    found = {normalize_claim(c["claim"]) for c in claims}
+    return len(deck_lines & found) / len(deck_lines)
+
+
+async def main(args):
+    settings = get_settings()
+    settings.claim_extraction_concurrency = args.concurrency
+    pages = make_deck_pages(args.pages, args.lines_per_page)
+    deck_chars = sum(len(page) for page in pages)
+
+    graph = PitchDeckVerificationGraph()
+    models = ChunkAwareModels(args.base_latency, args.latency_per_1k)
+    graph.llm.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    extractor = extraction_only(graph)
+
+    truncated = await run(graph, extractor, models, ["\n".join(pages)[:3000]], 3000)
+    single = await run(graph, extractor, models, pages, deck_chars + len(pages))
+    chunked = await run(graph, extractor, models, pages, args.chunk_chars)
+
+    print(f"\nDeck: {args.pages} pages, {deck_chars} characters, "
+          f"{args.chunk_chars}-char chunks, concurrency {args.concurrency}\n")
+    for label, outcome, covered in [
+        ("first 3000 chars (old)", truncated, coverage(truncated["claims"], pages)),
+        ("single call, whole deck", single, coverage(single["claims"], pages)),
+        ("chunked map-reduce", chunked, coverage(chunked["claims"], pages)),
+    ]:
+        print(f"{label:>24}: {outcome['seconds']:5.2f}s, {outcome['calls']:>3} calls, "
+              f"{len(outcome['claims']):>4} claims, {covered:6.1%} of deck lines covered")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=24)
+    parser.add_argument("--lines-per-page", type=int, default=10)
+    parser.add_argument("--chunk-chars", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-latency", type=float, default=0.3,
+                        help="Seconds per stand-in call regardless of input")
+    parser.add_argument("--latency-per-1k", type=float, default=0.4,
+                        help="Extra stand-in seconds per 1000 characters of deck text")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""
+PDF extraction benchmark: legacy string concatenation vs page-indexed extraction
+
+Generates synthetic decks of 10, 100 and 500 pages and times:
+  - legacy:   the original `text += page.extract_text()` loop
+  - serial:   PDFParser.extract_document with the process pool disabled
+  - parallel: PDFParser.extract_document with the process pool
+
+Usage (from backend/):
+    python -m benchmarks.pdf_benchmark --pages 10 100 500 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+import PyPDF2  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.services.pdf_parser import PDFParser  # noqa: E402
+from benchmarks.sample_pdf import make_deck  # noqa: E402
+
+
+def legacy_extract_text(pdf_path: str) -> str:
+    text = ""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+    return text
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(args):
+    settings = get_settings()
+    if args.workers:
+        settings.pdf_parse_workers = args.workers
+    print(f"Process pool workers: {settings.pdf_parse_workers or os.cpu_count()}\n")
+    print(f"{'pages':>6} {'legacy':>9} {'serial':>9} {'parallel':>9} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for page_count in args.pages:
+            path = os.path.join(tmp, f"deck_{page_count}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_deck(page_count))
+
+            legacy = best_of(lambda: legacy_extract_text(path), args.repeat)
+
+            settings.pdf_parallel_min_pages = page_count + 1
+            serial = best_of(lambda: PDFParser.extract_document(path), args.repeat)
+
+            settings.pdf_parallel_min_pages = 1
+            PDFParser.extract_document(path)  # warm up the worker processes
+            parallel = best_of(lambda: PDFParser.extract_document(path), args.repeat)
+
+            print(f"{page_count:>6} {legacy:>8.3f}s {serial:>8.3f}s {parallel:>8.3f}s "
+                  f"{legacy / parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="Pool size (default: one per CPU)")
+    main(parser.parse_args())
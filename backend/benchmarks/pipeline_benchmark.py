@@ -0,0 +1,75 @@
+"""
+Pipelining benchmark: sequential vs overlapped extraction and research
+
+Streams the multi-agent workflow over a synthetic deck with the Gemini and
+search stand-ins, once with PIPELINE_RESEARCH off (research waits for the
+whole extraction) and once with it on (extraction is streamed and research
+starts on each claim as soon as it is parsed). Reports when the first claim
+was researched, when research and the first verification finished, and the
+total run time.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline_benchmark --pages 12 --llm-latency 2 --search-latency 1
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("CLAIM_STORE_ENABLED", "false")
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+os.environ.setdefault("SEARCH_REQUESTS_PER_MINUTE", "0")
+
+from app.config import get_settings  # noqa: E402
+from app.services.fake_backends import FakeGeminiClient, FakeSearch  # noqa: E402
+from app.services.langgraph_agents import PitchDeckVerificationGraph  # noqa: E402
+from benchmarks.sample_pdf import make_deck_pages  # noqa: E402
+
+
+async def timed_stream(graph: PitchDeckVerificationGraph, pages) -> dict:
+    """Seconds from the start of the run to each milestone"""
+    marks = {}
+    start = time.perf_counter()
+    async for event in graph.stream_analysis("\n".join(pages), pages):
+        name = event["event"]
+        if name in ("claim_researched", "research_complete", "claim_verified", "complete") and name not in marks:
+            marks[name] = time.perf_counter() - start
+    return marks
+
+
+async def main(args):
+    settings = get_settings()
+    pages = make_deck_pages(args.pages, args.lines_per_page)
+
+    graph = PitchDeckVerificationGraph()
+    graph.llm.client = FakeGeminiClient(latency=args.llm_latency)
+    graph.tools.search = FakeSearch(args.search_latency)
+
+    outcomes = {}
+    for label, pipelined in [("sequential", False), ("pipelined", True)]:
+        settings.pipeline_research = pipelined
+        runs = [await timed_stream(graph, pages) for _ in range(args.runs)]
+        outcomes[label] = {
+            name: sum(run.get(name, 0.0) for run in runs) / len(runs)
+            for name in ("claim_researched", "research_complete", "claim_verified", "complete")
+        }
+
+    print(f"\nDeck: {args.pages} pages, LLM {args.llm_latency}s, search {args.search_latency}s, "
+          f"mean of {args.runs} run(s)\n")
+    print(f"{'':>12}  {'first research':>14}  {'research done':>13}  {'first verdict':>13}  {'total':>7}")
+    for label, marks in outcomes.items():
+        print(f"{label:>12}  {marks['claim_researched']:13.2f}s  {marks['research_complete']:12.2f}s  "
+              f"{marks['claim_verified']:12.2f}s  {marks['complete']:6.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--lines-per-page", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument("--search-latency", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""
+Rate limit benchmark: a burst of Gemini calls against a stand-in quota
+
+The stand-in model rejects calls with 429 RESOURCE_EXHAUSTED once more than
+--quota calls arrive within a sliding one-second window (a minute-scale quota
+compressed into seconds). The same burst is sent through LLMClient twice:
+with no limiter and no retries, as before, and with the shared token bucket
+set to the quota plus backoff on 429.
+
+Usage (from backend/):
+    python -m benchmarks.rate_limit_benchmark --calls 60 --quota 10
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import deque
+from types import SimpleNamespace
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from google.genai import errors  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.services import rate_limiter  # noqa: E402
+from app.services.llm_client import LLMClient  # noqa: E402
+
+
+class QuotaModels:
+    """Stand-in for client.aio.models that enforces a per-second request quota"""
+
+    def __init__(self, quota: int, latency: float):
+        self.quota = quota
+        self.latency = latency
+        self.accepted = deque()
+        self.rejected = 0
+
+    async def generate_content(self, model, contents, config=None):
+        now = time.monotonic()
+        while self.accepted and now - self.accepted[0] >= 1.0:
+            self.accepted.popleft()
+        if len(self.accepted) >= self.quota:
+            self.rejected += 1
+            raise errors.ClientError(429, {"error": {
+                "code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"
+            }})
+        self.accepted.append(now)
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text="ok", usage_metadata=None)
+
+
+async def burst(calls: int, quota: int, latency: float) -> dict:
+    models = QuotaModels(quota, latency)
+    client = LLMClient()
+    client.cache = None
+    client.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+
+    async def call(i: int) -> bool:
+        try:
+            await client.generate(f"prompt {i}")
+            return True
+        except errors.APIError:
+            return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[call(i) for i in range(calls)])
+    elapsed = time.perf_counter() - start
+    return {"ok": sum(results), "elapsed": elapsed, "rejected": models.rejected}
+
+
+async def main(args):
+    settings = get_settings()
+    runs = [
+        ("no limiter, no retries", 0, 1),
+        ("token bucket + backoff", args.quota * 60, 8),
+    ]
+    print(f"\n{args.calls} concurrent calls, quota {args.quota} calls/second\n")
+    for label, requests_per_minute, attempts in runs:
+        settings.llm_requests_per_minute = requests_per_minute
+        settings.llm_max_retries = attempts
+        settings.llm_retry_base_delay = 0.25
+        rate_limiter.get_llm_limiter.cache_clear()
+        outcome = await burst(args.calls, args.quota, args.latency)
+        print(f"{label:>24}: {outcome['ok']:>3}/{args.calls} succeeded in {outcome['elapsed']:5.2f}s "
+              f"({outcome['ok'] / outcome['elapsed']:5.1f} calls/s), {outcome['rejected']} 429s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--quota", type=int, default=10, help="Calls accepted per second")
+    parser.add_argument("--latency", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+Revision benchmark: full re-analysis of a revised deck vs incremental re-analysis
+
+Analyzes a synthetic deck, then a second version with a few slides edited and
+one inserted, first from scratch through run_agent_analysis and then against
+the first version through run_revision_analysis. Uses the Gemini and search
+stand-ins, with caches and the claim store off so only the revision logic
+saves work.
+
+Usage (from backend/):
+    python -m benchmarks.revision_benchmark --pages 20 --changed 2
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+WORK_DIR = tempfile.mkdtemp(prefix="sago-revision-bench-")
+for key, value in {
+    "GOOGLE_API_KEY": "benchmark-placeholder",
+    "LLM_BACKEND": "fake",
+    "SEARCH_BACKEND": "fake",
+    "RESULT_CACHE_ENABLED": "false",
+    "SEARCH_CACHE_ENABLED": "false",
+    "LLM_CACHE_ENABLED": "false",
+    "CLAIM_STORE_ENABLED": "false",
+    "LLM_REQUESTS_PER_MINUTE": "0",
+    "LLM_TOKENS_PER_MINUTE": "0",
+    "SEARCH_REQUESTS_PER_MINUTE": "0",
+    "CACHE_DIR": os.path.join(WORK_DIR, "cache"),
+    "DATA_DIR": os.path.join(WORK_DIR, "data"),
+    "UPLOAD_DIR": os.path.join(WORK_DIR, "uploads"),
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.config import get_settings  # noqa: E402
+from app.routes import pitch_deck  # noqa: E402
+from app.services.container import ServiceContainer  # noqa: E402
+from benchmarks.sample_pdf import make_deck_pages, make_pdf  # noqa: E402
+
+
+def revise(pages: list, changed: int) -> list:
+    """Edit the figures on `changed` slides spread through the deck and insert one new slide"""
+    revised = list(pages)
+    step = max(1, len(pages) // (changed + 1))
+    for i in range(1, changed + 1):
+        index = min(len(revised) - 1, i * step)
+        revised[index] = revised[index].replace("ARR", "ARR (audited)").replace("paying customers", "paying logos")
+    revised.insert(len(revised) // 2, "Slide new\nWe closed 3 enterprise pilots worth $450K in Q3.")
+    return revised
+
+
+def store(services: ServiceContainer, pages: list, filename: str) -> str:
+    stored = services.upload_store.save_stream(io.BytesIO(make_pdf(pages)), filename, max_bytes=50 * 1024 * 1024)
+    return stored.file_id
+
+
+def describe(label: str, seconds: float, result: dict):
+    usage = result["summary"].get("usage", {})
+    print(f"  {label}: {seconds:6.2f}s  LLM calls {usage.get('llm', {}).get('calls', 0):3d}  "
+          f"tokens {usage.get('llm', {}).get('input_tokens', 0):6d}  searches {usage.get('tools', {}).get('calls', 0):3d}  "
+          f"claims {result['summary']['total_claims']}")
+
+
+async def main(args):
+    settings = get_settings()
+    settings.fake_llm_latency = args.llm_latency
+    settings.fake_search_latency = args.search_latency
+    services = ServiceContainer()
+
+    v1_pages = make_deck_pages(args.pages, args.lines_per_page)
+    v1 = store(services, v1_pages, "deck-v1.pdf")
+    v2 = store(services, revise(v1_pages, args.changed), "deck-v2.pdf")
+    for file_id in (v1, v2):
+        await pitch_deck.load_document(services, file_id)
+    await pitch_deck.run_agent_analysis(services, v1, use_cache=False)
+
+    start = time.perf_counter()
+    full = await pitch_deck.run_agent_analysis(services, v2, use_cache=False)
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental = await pitch_deck.run_revision_analysis(services, v2, v1, use_cache=False)
+    incremental_seconds = time.perf_counter() - start
+    await services.aclose()
+
+    revision = incremental["revision"]
+    print(f"\n{args.pages}-page deck, {args.changed} slide(s) edited and 1 inserted, "
+          f"LLM {args.llm_latency}s, search {args.search_latency}s\n")
+    describe("full re-analysis", full_seconds, full)
+    describe("revision        ", incremental_seconds, incremental)
+    print(f"  pages: changed {revision['pages']['changed']}, extracted {revision['pages']['extracted']}")
+    claims = revision["claims"]
+    print(f"  claims: {claims['unchanged']} unchanged, {len(claims['changed'])} changed, "
+          f"{len(claims['added'])} added, {len(claims['removed'])} removed; "
+          f"{incremental['summary']['reused_verifications']} verdicts reused")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--changed", type=int, default=2)
+    parser.add_argument("--lines-per-page", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    asyncio.run(main(parser.parse_args()))
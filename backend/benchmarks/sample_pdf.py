@@ -0,0 +1,65 @@
+"""
+Synthetic pitch deck PDFs for benchmarks, written without extra dependencies
+"""
+from typing import List
+
+
+SLIDE_LINES = [
+    "The global {market} market is worth ${size}B and growing {cagr}% CAGR.",
+    "We have {customers} paying customers and ${arr}M ARR, up {growth}x year over year.",
+    "Our CEO was previously VP Engineering at Stripe with 15 years in payments.",
+    "Our engine is {speed}x faster than the incumbent on the same hardware.",
+    "Net revenue retention is {nrr}% and CAC payback is {payback} months.",
+]
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Build a minimal PDF with one Helvetica text block per page"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+        ),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_text in enumerate(pages):
+        lines = [line.replace("\\", "").replace("(", "").replace(")", "") for line in page_text.split("\n")]
+        stream = "BT /F1 11 Tf 40 760 Td 13 TL " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out.encode("latin-1")))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_offset = len(out.encode("latin-1"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def make_deck_pages(page_count: int, lines_per_page: int = 40) -> List[str]:
+    """Slide texts for a deck of page_count slides, each with lines_per_page lines of claims"""
+    pages = []
+    for page in range(page_count):
+        lines = [f"Slide {page + 1}"]
+        for line in range(lines_per_page):
+            template = SLIDE_LINES[(page + line) % len(SLIDE_LINES)]
+            lines.append(template.format(
+                market=["analytics", "payments", "logistics"][page % 3],
+                size=10 + page % 90, cagr=5 + line % 30, customers=100 + page * 7,
+                arr=1 + page % 20, growth=2 + line % 4, speed=3 + line % 10,
+                nrr=100 + line % 40, payback=6 + line % 18
+            ))
+        pages.append("\n".join(lines))
+    return pages
+
+
+def make_deck(page_count: int, lines_per_page: int = 40) -> bytes:
+    """A deck of page_count slides, each with lines_per_page lines of claims"""
+    return make_pdf(make_deck_pages(page_count, lines_per_page))
@@ -0,0 +1,55 @@
+"""
+Cold-start benchmark: import time and memory of the API process
+
+Each sample runs in a fresh interpreter so module caches don't carry over.
+"cold" only imports app.main (what a worker does before serving /health);
+"warm" additionally builds every service in the container, which is the cost
+the first analysis request pays.
+
+Usage (from backend/):
+    python -m benchmarks.startup_benchmark --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, resource, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+if {warm}:
+    from app.services.container import ServiceContainer
+    services = ServiceContainer()
+    for name in ("pdf_parser", "result_cache", "gemini_service", "langgraph_agent", "email_service"):
+        getattr(services, name)
+total = time.perf_counter() - start
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"import_s": imported, "total_s": total, "rss_mb": rss_mb}}))
+"""
+
+
+def sample(warm: bool) -> dict:
+    env = {**os.environ, "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "benchmark-placeholder")}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(warm=warm)],
+        capture_output=True, text=True, check=True, env=env
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(args):
+    for label, warm in [("cold", False), ("warm", True)]:
+        runs = [sample(warm) for _ in range(args.runs)]
+        total = statistics.median(r["total_s"] for r in runs)
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        print(f"{label:>5}: {total * 1000:7.0f} ms median over {args.runs} runs, {rss:6.1f} MB peak RSS")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    main(parser.parse_args())
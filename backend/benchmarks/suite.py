@@ -0,0 +1,299 @@
+"""
+Offline benchmark suite: PDF parsing, each agent node, the full workflow and the HTTP API
+
+Everything runs against the fake Gemini and search backends (LLM_BACKEND=fake,
+SEARCH_BACKEND=fake) with caches, the claim store and rate limits off, so runs
+are repeatable without network access. Each case runs --iterations requests
+with --concurrency clients in flight and reports p50/p95/p99 latency and
+throughput. Results are written to JSON; pass --compare with an earlier file
+to flag regressions.
+
+Concurrent HTTP requests each get their own deck (same slides, different
+bytes), so upload deduplication and in-flight analysis deduplication don't
+skew the per-request numbers; deduplication is measured in its own case.
+
+Usage (from backend/):
+    python -m benchmarks.suite --concurrency 8 --iterations 40
+    python -m benchmarks.suite --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+WORK_DIR = tempfile.mkdtemp(prefix="sago-bench-")
+for key, value in {
+    "GOOGLE_API_KEY": "benchmark-placeholder",
+    "LLM_BACKEND": "fake",
+    "SEARCH_BACKEND": "fake",
+    "RESULT_CACHE_ENABLED": "false",
+    "SEARCH_CACHE_ENABLED": "false",
+    "LLM_CACHE_ENABLED": "false",
+    "CLAIM_STORE_ENABLED": "false",
+    "LLM_REQUESTS_PER_MINUTE": "0",
+    "LLM_TOKENS_PER_MINUTE": "0",
+    "SEARCH_REQUESTS_PER_MINUTE": "0",
+    "CACHE_DIR": os.path.join(WORK_DIR, "cache"),
+    "DATA_DIR": os.path.join(WORK_DIR, "data"),
+    "UPLOAD_DIR": os.path.join(WORK_DIR, "uploads"),
+}.items():
+    os.environ.setdefault(key, value)
+
+import httpx  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.services.langgraph_agents import AgentState, PitchDeckVerificationGraph  # noqa: E402
+from app.services.pdf_parser import PDFParser  # noqa: E402
+from benchmarks.sample_pdf import make_deck, make_deck_pages, make_pdf  # noqa: E402
+
+NODES = ["extract_claims", "research_claims", "verify_claims", "generate_questions"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def measure(call: Callable[[], Awaitable], iterations: int, concurrency: int) -> Dict:
+    """Run `iterations` calls with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(iterations)])
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        return {"iterations": iterations, "errors": errors}
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "throughput_per_s": round(len(latencies) / elapsed, 2),
+    }
+
+
+def single_node(graph: PitchDeckVerificationGraph, name: str):
+    """One agent node compiled on its own, so it runs with a stream writer like in the workflow"""
+    workflow = StateGraph(AgentState)
+    workflow.add_node(name, getattr(graph, f"{name}_node"))
+    workflow.set_entry_point(name)
+    workflow.add_edge(name, END)
+    return workflow.compile()
+
+
+async def run_node(node_graph, state: AgentState):
+    result = await node_graph.ainvoke(dict(state))
+    if result.get("research_prefetch") is not None:
+        # Research started during extraction belongs to the next node, which is not run here
+        result["research_prefetch"].cancel()
+
+
+async def node_inputs(graph: PitchDeckVerificationGraph, document) -> Dict[str, AgentState]:
+    """The state each node receives, captured from one full run"""
+    inputs = {}
+    state = graph._initial_state(document.text, document.pages)
+    step = 0
+    async for values in graph.workflow.astream(state, stream_mode="values"):
+        if step < len(NODES):
+            # Measure each node on its own, without research prefetched by the extraction step
+            inputs[NODES[step]] = {**values, "research_prefetch": None}
+        step += 1
+    return inputs
+
+
+def distinct_decks(count: int, pages: int, lines_per_page: int) -> List[bytes]:
+    """Decks with the same slides but different bytes, one per request"""
+    slides = make_deck_pages(pages, lines_per_page)
+    return [make_pdf([f"{slides[0]}\nBenchmark copy {i}"] + slides[1:]) for i in range(count)]
+
+
+async def run_suite(args) -> Dict:
+    settings = get_settings()
+    settings.fake_llm_latency = args.llm_latency
+    settings.fake_search_latency = args.search_latency
+    settings.fake_error_rate = args.error_rate
+
+    os.makedirs(WORK_DIR, exist_ok=True)
+    pdf_path = os.path.join(WORK_DIR, "deck.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(make_deck(args.pages, args.lines_per_page))
+
+    results: Dict[str, Dict] = {}
+
+    def report(name: str, outcome: Dict):
+        results[name] = outcome
+        print(f"{name:>28}: p50 {outcome.get('p50_ms', 0):8.1f}ms  p95 {outcome.get('p95_ms', 0):8.1f}ms  "
+              f"p99 {outcome.get('p99_ms', 0):8.1f}ms  {outcome.get('throughput_per_s', 0):7.2f}/s  "
+              f"errors {outcome['errors']}", flush=True)
+
+    # PDF parsing is CPU-bound; each call runs in a worker thread like the upload route
+    parser = PDFParser()
+    report("pdf.extract_text", await measure(
+        lambda: asyncio.to_thread(parser.extract_text, pdf_path), args.iterations, args.concurrency
+    ))
+
+    graph = PitchDeckVerificationGraph()
+    document = parser.extract_document(pdf_path)
+    inputs = await node_inputs(graph, document)
+    for name in NODES:
+        node_graph = single_node(graph, name)
+        report(f"node.{name}", await measure(
+            lambda node_graph=node_graph, state=inputs[name]: run_node(node_graph, state),
+            args.iterations, args.concurrency
+        ))
+
+    report("workflow.analyze_pitch_deck", await measure(
+        lambda: graph.analyze_pitch_deck(document.text, document.pages), args.iterations, args.concurrency
+    ))
+
+    # HTTP endpoints through the ASGI app, including its lifespan
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            async def upload(pdf_bytes: bytes) -> str:
+                response = await client.post(
+                    "/api/pitch-deck/upload", files={"file": ("deck.pdf", pdf_bytes, "application/pdf")}
+                )
+                response.raise_for_status()
+                return response.json()["file_id"]
+
+            async def upload_all() -> List[str]:
+                decks = distinct_decks(args.iterations, args.pages, args.lines_per_page)
+                return [await upload(pdf_bytes) for pdf_bytes in decks]
+
+            async def post(path: str):
+                response = await client.post(path)
+                response.raise_for_status()
+
+            async def get(path: str):
+                response = await client.get(path)
+                response.raise_for_status()
+
+            report("http.GET /health", await measure(
+                lambda: get("/api/pitch-deck/health"), args.iterations, args.concurrency))
+            uploads = iter(distinct_decks(args.iterations, args.pages, args.lines_per_page))
+            report("http.POST /upload", await measure(
+                lambda: upload(next(uploads)), args.iterations, args.concurrency))
+
+            file_ids = iter(await upload_all())
+            report("http.POST /analyze", await measure(
+                lambda: post(f"/api/pitch-deck/analyze/{next(file_ids)}?use_cache=false"),
+                args.iterations, args.concurrency))
+            file_ids = iter(await upload_all())
+            report("http.POST /analyze-with-agents", await measure(
+                lambda: post(f"/api/pitch-deck/analyze-with-agents/{next(file_ids)}?use_cache=false"),
+                args.iterations, args.concurrency))
+
+            # Every request for one deck: concurrent ones attach to the run in flight
+            async def flights() -> Dict:
+                response = await client.get("/api/pitch-deck/cache/stats")
+                response.raise_for_status()
+                return response.json()["analyses_in_flight"]
+
+            file_id = await upload(make_deck(args.pages, args.lines_per_page))
+            before = await flights()
+            outcome = await measure(
+                lambda: post(f"/api/pitch-deck/analyze-with-agents/{file_id}?use_cache=false"),
+                args.iterations, args.concurrency)
+            after = await flights()
+            outcome["workflow_runs"] = after["runs"] - before["runs"]
+            outcome["joined"] = after["joined"] - before["joined"]
+            report("http.analyze-with-agents dedup", outcome)
+
+    return results
+
+
+def compare(current: Dict, baseline_path: str, threshold: float) -> List[str]:
+    """Cases whose p95 grew or throughput fell by more than `threshold` percent"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\nCompared with {baseline_path}:")
+    for name, outcome in current.items():
+        before = baseline.get(name)
+        if not before or "p95_ms" not in before or "p95_ms" not in outcome:
+            continue
+        p95_change = (outcome["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        throughput_change = (
+            (outcome["throughput_per_s"] - before["throughput_per_s"]) / before["throughput_per_s"] * 100
+        )
+        flag = ""
+        if p95_change > threshold or throughput_change < -threshold:
+            flag = "  <-- regression"
+            regressions.append(name)
+        print(f"{name:>28}: p95 {p95_change:+6.1f}%  throughput {throughput_change:+6.1f}%{flag}")
+    return regressions
+
+
+def main(args) -> int:
+    print(f"\nOffline suite: {args.iterations} iterations, concurrency {args.concurrency}, "
+          f"{args.pages}-page deck, LLM {args.llm_latency}s, search {args.search_latency}s, "
+          f"error rate {args.error_rate}\n")
+    results = asyncio.run(run_suite(args))
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"suite-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "params": vars(args),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--lines-per-page", type=int, default=12)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/suite-<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change in p95 or throughput counted as a regression")
+    sys.exit(main(parser.parse_args()))
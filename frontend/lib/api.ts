@@ -5,6 +5,7 @@ export interface UploadResponse {
   filename: string;
   text_preview: string;
   word_count: number;
+  page_count: number;
   message: string;
 }
 
@@ -14,19 +15,86 @@ export interface AnalysisResult {
     claim: string;
     category: string;
     importance: string;
+    source_pages?: [number, number];
   }>;
   verification_results: Array<{
     claim: string;
     verification_result: string;
+    reused?: {
+      matched_claim: string;
+      // 'revision': carried over from the previous version of the deck
+      match: 'exact' | 'near' | 'revision';
+      similarity: number;
+      // Company the verdict was verified for; for 'revision', the previous version's file_id
+      source: string | null;
+      verified_at: number;
+      age_seconds: number;
+    };
   }>;
   questions: string[];
   summary: {
     total_claims: number;
     verified_claims: number;
+    reused_verifications?: number;
     questions_generated: number;
+    timings?: Record<string, number>;
+    usage?: {
+      llm: {
+        calls: number;
+        cache_hits: number;
+        errors: number;
+        retries: number;
+        input_tokens: number;
+        output_tokens: number;
+        seconds: number;
+        estimated_cost_usd: number;
+      };
+      tools: {
+        calls: number;
+        cache_hits: number;
+        coalesced: number;
+        errors: number;
+        seconds: number;
+        saved_calls: number;
+      };
+    };
   };
 }
 
+export interface AnalysisJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  result: AnalysisResult | null;
+  error: string | null;
+}
+
+export type AnalysisEvent =
+  | { event: 'claim_extracted'; pages: [number, number]; claim: AnalysisResult['claims'][number] }
+  | { event: 'chunk_extracted'; pages: [number, number]; claims: number }
+  | { event: 'claims_extracted'; step: string; company_name: string; claims: AnalysisResult['claims'] }
+  | { event: 'claim_researched'; claim: string; category: string }
+  | { event: 'research_complete'; step: string; researched_claims: number }
+  | { event: 'claim_verified'; verification: AnalysisResult['verification_results'][number] }
+  | { event: 'verification_complete'; step: string; verification_results: AnalysisResult['verification_results'] }
+  | { event: 'questions_generated'; step: string; questions: string[] }
+  | { event: 'joined'; detail: string }
+  | { event: 'complete'; result: AnalysisResult }
+  | { event: 'error'; detail: string };
+
+const ANALYSIS_EVENTS: AnalysisEvent['event'][] = [
+  'claim_extracted',
+  'chunk_extracted',
+  'claims_extracted',
+  'claim_researched',
+  'research_complete',
+  'claim_verified',
+  'verification_complete',
+  'questions_generated',
+  'joined',
+  'complete',
+  'error',
+];
+
 export const api = {
   async uploadPitchDeck(file: File): Promise<UploadResponse> {
     const formData = new FormData();
@@ -67,4 +135,53 @@ export const api = {
 
     return response.json();
   },
+
+  async submitAnalysisJob(fileId: string): Promise<{ job_id: string; status: string; status_url: string }> {
+    const response = await fetch(`${API_BASE_URL}/api/jobs/analyze-with-agents/${fileId}`, {
+      method: 'POST',
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to submit analysis job');
+    }
+
+    return response.json();
+  },
+
+  async getAnalysisJob(jobId: string): Promise<AnalysisJob> {
+    const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}`);
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch analysis job');
+    }
+
+    return response.json();
+  },
+
+  /**
+   * Stream multi-agent progress over Server-Sent Events.
+   * Calls onEvent for every step as it completes; returns a function that closes the stream.
+   */
+  streamAnalysisWithAgents(fileId: string, onEvent: (event: AnalysisEvent) => void): () => void {
+    const source = new EventSource(`${API_BASE_URL}/api/pitch-deck/analyze-stream/${fileId}`);
+
+    for (const name of ANALYSIS_EVENTS) {
+      source.addEventListener(name, (message) => {
+        const event = JSON.parse((message as MessageEvent).data) as AnalysisEvent;
+        onEvent(event);
+        if (event.event === 'complete' || event.event === 'error') {
+          source.close();
+        }
+      });
+    }
+
+    source.onerror = () => {
+      if (source.readyState !== EventSource.CLOSED) {
+        source.close();
+        onEvent({ event: 'error', detail: 'Lost connection to analysis stream' });
+      }
+    };
+
+    return () => source.close();
+  },
 };